@@ -115,6 +115,9 @@ class SimulationConfig:
     STATS_UPDATE_FREQUENCY = 5   # Actualizar stats cada N frames
     PARTICLE_UPDATE_FREQUENCY = 2  # Actualizar partículas cada N frames
     
+    # === DEPURACIÓN ===
+    CONTROL_LOG_SIZE = 128       # Entradas máximas del log diferido de controles
+    
     @classmethod
     def get_stats_panel_width(cls):
         """Calcular ancho del panel de estadísticas dinámicamente"""
@@ -8,6 +8,8 @@ import time
 import sys
 import random
 import statistics as _stats
+from collections import deque
+from enum import IntEnum
 
 from config import SimulationConfig
 from src.agents.advanced_agent import AdvancedAgent, SimpleNeuralNetwork
@@ -17,12 +19,58 @@ from src.evolution.genetic_algorithm import GeneticAlgorithm
 from src.ui.renderer import SpriteManager, ParticleSystem
 from src.ui.stats import StatsPanel
 from src.ui.popup import SummaryPopup
+from src.ui.fonts import render_text
 from src.analytics.learning_monitor import LearningMonitor
 from src.analytics.clustering import BehaviorClusterer
 
 # Agregar src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Límites y pasos del zoom de ventana
+ZOOM_STEP_WIDTH = 100
+ZOOM_STEP_HEIGHT = 67
+ZOOM_MIN_SIZE = (800, 533)
+ZOOM_MAX_SIZE = (1600, 1067)
+
+
+class ControlAction(IntEnum):
+    """Acciones de teclado del bucle principal."""
+    QUIT = 0
+    TOGGLE_PAUSE = 1
+    ZOOM_IN = 2
+    ZOOM_OUT = 3
+    DUMP_LOG = 4
+
+
+# Tecla -> acción (una sola búsqueda por evento en lugar de la cadena de comparaciones)
+KEY_BINDINGS = {
+    pygame.K_ESCAPE: ControlAction.QUIT,
+    pygame.K_SPACE: ControlAction.TOGGLE_PAUSE,
+    pygame.K_PLUS: ControlAction.ZOOM_IN,
+    pygame.K_EQUALS: ControlAction.ZOOM_IN,
+    pygame.K_MINUS: ControlAction.ZOOM_OUT,
+    pygame.K_F1: ControlAction.DUMP_LOG,
+}
+
+
+def _clamp(value, low, high):
+    """Limita un valor al rango [low, high]."""
+    return low if value < low else (high if value > high else value)
+
+
+def _build_background(size, grass_sprites):
+    """Rasteriza una vez el fondo estático: color base más el damero de pasto del área de juego."""
+    background = pygame.Surface(size)
+    background.fill((40, 40, 60))  # Fondo azul oscuro
+    # Pasto con variación hasta el perímetro (área de juego fija: 1200 - 240 panel)
+    background.blits([
+        (grass_sprites[(x // 16 + y // 16) % 2], (x, y))
+        for x in range(0, 960, 16)
+        for y in range(0, 800, 16)
+    ], False)
+    return background
+
+
 def find_safe_position(world, agents, radius=16):
     """Encuentra una posición segura para un agente, evitando todos los obstáculos."""
     
@@ -39,24 +87,18 @@ def find_safe_position(world, agents, radius=16):
         collision = False
         
         # Verificar colisión con obstáculos normales
-        for obstacle in world.obstacles:
-            if obstacle.collides_with(x, y, radius):
-                collision = True
-                break
+        if world.hits_obstacle(x, y, radius):
+            collision = True
         
         # Verificar colisión con perímetro
         if not collision:
-            for perimeter_obj in world.perimeter_obstacles:
-                if perimeter_obj.collides_with(x, y, radius * 2, radius * 2):
-                    collision = True
-                    break
+            if world.hits_perimeter(x, y, radius * 2, radius * 2):
+                collision = True
         
         # Verificar colisión con estanques
         if not collision:
-            for pond_obj in world.pond_obstacles:
-                if pond_obj.collides_with(x, y, radius * 2, radius * 2):
-                    collision = True
-                    break
+            if world.hits_pond(x, y, radius * 2, radius * 2):
+                collision = True
         
         # Verificar colisión con fortalezas (IMPORTANTE!)
         if not collision and hasattr(world, '_is_inside_fortress'):
@@ -91,24 +133,18 @@ def fix_agent_positions(world, agents):
         needs_fixing = False
         
         # Verificar colisión con obstáculos normales
-        for obstacle in world.obstacles:
-            if obstacle.collides_with(agent.x, agent.y, agent.radius):
-                needs_fixing = True
-                break
+        if world.hits_obstacle(agent.x, agent.y, agent.radius):
+            needs_fixing = True
         
         # Verificar colisión con perímetro
         if not needs_fixing:
-            for perimeter_obj in world.perimeter_obstacles:
-                if perimeter_obj.collides_with(agent.x, agent.y, agent.radius * 2, agent.radius * 2):
-                    needs_fixing = True
-                    break
+            if world.hits_perimeter(agent.x, agent.y, agent.radius * 2, agent.radius * 2):
+                needs_fixing = True
         
         # Verificar colisión con estanques
         if not needs_fixing:
-            for pond_obj in world.pond_obstacles:
-                if pond_obj.collides_with(agent.x, agent.y, agent.radius * 2, agent.radius * 2):
-                    needs_fixing = True
-                    break
+            if world.hits_pond(agent.x, agent.y, agent.radius * 2, agent.radius * 2):
+                needs_fixing = True
         
         # Verificar colisión con fortalezas (IMPORTANTE!)
         if not needs_fixing and hasattr(world, '_is_inside_fortress'):
@@ -148,7 +184,8 @@ def main():
     pygame.init()
     if not config.HEADLESS_MODE:
         # Crear ventana de visualización (tamaño deseado)
-        display_screen = pygame.display.set_mode((screen_width, screen_height))
+        display_size = (screen_width, screen_height)  # Se reconstruye solo al cambiar el zoom
+        display_screen = pygame.display.set_mode(display_size)
         pygame.display.set_caption("Ecosistema Evolutivo IA")
         
         # Crear superficie de renderizado (tamaño base fijo)
@@ -161,19 +198,22 @@ def main():
         
         print(f"🎨 Factor de escalado: {scale_factor:.2f}x")
     else:
+        display_size = None
         display_screen = None
         render_surface = None
         scale_factor = 1.0
         print("🚀 MODO HEADLESS ACTIVADO - Sin render")
     clock = pygame.time.Clock()
     
-    # Crear fuentes una vez (cache para mejor rendimiento)
-    pause_font = pygame.font.Font(None, 24) if not config.HEADLESS_MODE else None
+    # Log diferido de controles: evita print() en el camino de entrada (F1 para volcar)
+    control_log = deque(maxlen=config.CONTROL_LOG_SIZE)
     
     # Crear sistemas de sprites y partículas
     sprite_manager = SpriteManager()
     particle_system = ParticleSystem()
     graves = []  # Tumbas persistentes hasta la próxima generación
+    background = None  # Fondo de pasto pre-renderizado (se reconstruye si cambian los sprites)
+    background_sprites = None
     dead_ids = set()  # Para detectar muertes nuevas sin duplicar tumbas
     
     # Crear cuadro de resumen
@@ -186,12 +226,16 @@ def main():
     # Crear mundo (sistema original) con cantidad de comida configurable
     world = World(config.get_game_area_width(), screen_height, config.FOOD_COUNT)  # Usar área de juego dinámica
     
+    # Límite derecho para reposicionar agentes: fijo durante la simulación, se calcula una vez
+    spawn_max_x = config.get_grass_area_width() - 20  # Solo área de pasto, evitando perímetro
+    
     # Crear algoritmo genético con configuración
     ga = GeneticAlgorithm(**config.get_genetic_params())
     ga.world = world  # Pasar referencia al mundo
     
     # Crear población inicial
     agents = ga._create_random_population()
+    world.alive_agents_count = len(agents)
     
     # Reposicionar agentes que spawnearon dentro de fortalezas O sobre obstáculos
     if config.FORTRESSES_ENABLED:
@@ -199,8 +243,7 @@ def main():
         for agent in agents:
             # Verificar si está dentro de fortalezas O sobre obstáculos
             needs_repositioning = (world._is_inside_fortress(agent.x, agent.y) or 
-                                  any(obstacle.collides_with(agent.x, agent.y, agent.radius) 
-                                      for obstacle in world.obstacles))
+                                  world.hits_obstacle(agent.x, agent.y, agent.radius))
             
             if needs_repositioning:
                 # Reposicionar fuera de fortalezas, obstáculos Y zona de estadísticas
@@ -208,17 +251,14 @@ def main():
                 while attempts < 500:  # Más intentos para mayor seguridad
                     # Área de juego válida: solo pasto, excluyendo perímetro y panel de estadísticas
                     # Usar dimensiones escaladas dinámicamente
-                    new_x = random.randint(20, config.get_grass_area_width() - 20)  # Solo área de pasto, evitando perímetro
+                    new_x = random.randint(20, spawn_max_x)  # Solo área de pasto, evitando perímetro
                     new_y = random.randint(20, screen_height - 20)  # Evitando perímetro superior e inferior
                     
                     # Verificar que no esté en fortaleza Y no colisione con obstáculos Y no esté en perímetro Y no esté en estanque
                     if (not world._is_inside_fortress(new_x, new_y) and
-                        not any(obstacle.collides_with(new_x, new_y, agent.radius) 
-                               for obstacle in world.obstacles) and
-                        not any(perimeter_obj.collides_with(new_x, new_y, agent.radius, agent.radius)
-                               for perimeter_obj in world.perimeter_obstacles) and
-                        not any(pond_obj.collides_with(new_x, new_y, agent.radius, agent.radius)
-                               for pond_obj in world.pond_obstacles)):
+                        not world.hits_obstacle(new_x, new_y, agent.radius) and
+                        not world.hits_perimeter(new_x, new_y, agent.radius, agent.radius) and
+                        not world.hits_pond(new_x, new_y, agent.radius, agent.radius)):
                         agent.x = new_x
                         agent.y = new_y
                         break
@@ -232,10 +272,8 @@ def main():
                         for test_y in [100, 200, 300, 400, 500, 600]:
                             # Verificar que no esté en estanque
                             safe_position = True
-                            for pond_obj in world.pond_obstacles:
-                                if pond_obj.collides_with(test_x, test_y, agent.radius, agent.radius):
-                                    safe_position = False
-                                    break
+                            if world.hits_pond(test_x, test_y, agent.radius, agent.radius):
+                                safe_position = False
                             if safe_position:
                                 safe_x, safe_y = test_x, test_y
                                 break
@@ -256,9 +294,10 @@ def main():
     print("   ESPACIO - Pausar/Reanudar")
     print("   +/= - Zoom IN (agrandar ventana)")
     print("   - - Zoom OUT (achicar ventana)")
+    print("   F1 - Volcar log de controles")
     
     # Tiempo de inicio de la simulación
-    simulation_start_time = time.time()
+    simulation_start_time = time.perf_counter()  # Monótono: no salta con ajustes del reloj del sistema
     
     # Bucle principal
     running = True
@@ -281,48 +320,72 @@ def main():
     print(f"⚡ Optimizaciones de rendimiento activadas:")
     print(f"   - FPS objetivo: {target_fps}")
     
+    # Manejadores de teclado indexados por ControlAction: cada tecla es una búsqueda y una llamada
+    zoom_steps = 0  # Pasos de zoom acumulados en el frame actual
+    
+    def _quit():
+        nonlocal running
+        running = False
+    
+    def _toggle_pause():
+        nonlocal paused
+        paused = not paused
+    
+    def _zoom_in():
+        nonlocal zoom_steps
+        zoom_steps += 1
+    
+    def _zoom_out():
+        nonlocal zoom_steps
+        zoom_steps -= 1
+    
+    def _dump_log():
+        # Volcar el log diferido de controles
+        while control_log:
+            print(control_log.popleft())
+    
+    control_handlers = [None] * len(ControlAction)
+    control_handlers[ControlAction.QUIT] = _quit
+    control_handlers[ControlAction.TOGGLE_PAUSE] = _toggle_pause
+    control_handlers[ControlAction.ZOOM_IN] = _zoom_in
+    control_handlers[ControlAction.ZOOM_OUT] = _zoom_out
+    control_handlers[ControlAction.DUMP_LOG] = _dump_log
+    
+    # Copiar flags de configuración a locales (evita la cadena config.X en el bucle)
+    headless_mode = config.HEADLESS_MODE
+    tree_cutting_enabled = config.TREE_CUTTING_ENABLED
+    fortresses_enabled = config.FORTRESSES_ENABLED
+    red_key_spawn_gen = config.RED_KEY_SPAWN_GEN
+    
     while running and generation <= max_generations:
         # Manejar eventos (solo si no está en modo headless)
-        if not config.HEADLESS_MODE:
+        if not headless_mode:
+            zoom_steps = 0  # Pasos de zoom acumulados en este frame
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Manejar clicks en el popup de resumen
-                    if event.button == 1:  # Click izquierdo
-                        mouse_pos = event.pos
-                        if summary_popup.handle_click(mouse_pos):
-                            pass  # El popup se cerró automáticamente
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    # Click izquierdo: el popup de resumen lo consume (y se cierra si es el botón)
+                    summary_popup.handle_click(event.pos)
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-                    elif event.key == pygame.K_SPACE:
-                        paused = not paused
-                    
-                    elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
-                        # Zoom in
-                        screen_width = min(screen_width + 100, 1600)
-                        screen_height = min(screen_height + 67, 1067)
-                        display_screen = pygame.display.set_mode((screen_width, screen_height))
-                        
-                        # Recalcular factor de escalado
-                        scale_x = screen_width / 1200.0
-                        scale_y = screen_height / 800.0
-                        scale_factor = min(scale_x, scale_y)
-                        
-                        print(f"🔍 Zoom IN: {screen_width}x{screen_height} (factor: {scale_factor:.2f}x)")
-                    elif event.key == pygame.K_MINUS:
-                        # Zoom out
-                        screen_width = max(screen_width - 100, 800)
-                        screen_height = max(screen_height - 67, 533)
-                        display_screen = pygame.display.set_mode((screen_width, screen_height))
-                        
-                        # Recalcular factor de escalado
-                        scale_x = screen_width / 1200.0
-                        scale_y = screen_height / 800.0
-                        scale_factor = min(scale_x, scale_y)
-                        
-                        print(f"🔍 Zoom OUT: {screen_width}x{screen_height} (factor: {scale_factor:.2f}x)")
+                    action = KEY_BINDINGS.get(event.key)
+                    if action is not None:
+                        control_handlers[action]()
+            
+            # Aplicar todos los pasos de zoom del frame en un solo cambio de ventana
+            if zoom_steps:
+                screen_width = _clamp(screen_width + zoom_steps * ZOOM_STEP_WIDTH, ZOOM_MIN_SIZE[0], ZOOM_MAX_SIZE[0])
+                screen_height = _clamp(screen_height + zoom_steps * ZOOM_STEP_HEIGHT, ZOOM_MIN_SIZE[1], ZOOM_MAX_SIZE[1])
+                display_size = (screen_width, screen_height)
+                display_screen = pygame.display.set_mode(display_size)
+                
+                # Recalcular factor de escalado
+                scale_x = screen_width / 1200.0
+                scale_y = screen_height / 800.0
+                scale_factor = min(scale_x, scale_y)
+                
+                label = "IN" if zoom_steps > 0 else "OUT"
+                control_log.append(f"🔍 Zoom {label}: {screen_width}x{screen_height} (factor: {scale_factor:.2f}x)")
         else:
             # En modo headless, avanzar automáticamente
             paused = False
@@ -336,7 +399,7 @@ def main():
                 agent.act(decisions, world, alive_agents, tick)
                 
                 # Sistema de corte de árboles
-                if config.TREE_CUTTING_ENABLED:
+                if tree_cutting_enabled:
                     # Intentar agarrar hacha
                     agent._try_pickup_axe(world)
                     
@@ -344,7 +407,7 @@ def main():
                     agent._try_cut_tree(world, tick)
                 
                 # Sistema de fortalezas/llaves/puertas/cofre
-                if config.FORTRESSES_ENABLED:
+                if fortresses_enabled:
                     # Intentar recoger llaves
                     agent._try_pickup_key(world, generation)
                     
@@ -368,11 +431,11 @@ def main():
                     dead_ids.add(agent.id)
 
         # Actualizar sistema de corte de árboles (solo si no está pausado)
-        if not paused and config.TREE_CUTTING_ENABLED:
+        if not paused and tree_cutting_enabled:
             world.update_tree_cutting_status()
         
         # Generar red_key en gen 11+ si no existe (solo una vez por generación)
-        if config.FORTRESSES_ENABLED and generation >= config.RED_KEY_SPAWN_GEN and not world.red_key:
+        if fortresses_enabled and generation >= red_key_spawn_gen and not world.red_key:
             world._generate_red_key(generation)
         
         # Actualizar mundo (solo si no está pausado)
@@ -383,7 +446,7 @@ def main():
         # Verificar si todos murieron o se acabó el tiempo
         if len(alive_agents) == 0 or tick >= max_ticks_per_generation:
             # Calcular tiempo acumulado desde el inicio de la simulación
-            elapsed_time = time.time() - simulation_start_time
+            elapsed_time = time.perf_counter() - simulation_start_time
             elapsed_minutes = int(elapsed_time // 60)
             elapsed_seconds = int(elapsed_time % 60)
             
@@ -447,6 +510,7 @@ def main():
                 print(f"   - ⏱️ Tiempo real acumulado: {elapsed_minutes}m {elapsed_seconds}s")
             else:
                 avg_fitness = max_fitness = avg_age = avg_food = avg_energy = 0
+                diversity = 0.0
                 alive_agents_for_stats = []  # Lista vacía si no hay agentes
             
             # Preparar datos para el cuadro de resumen
@@ -471,7 +535,7 @@ def main():
                 'chest_opened': world.chest.is_open if world.chest else False,
                 'total_agents': len(agents),
                 'alive_count': len(alive_agents_for_stats),
-                'diversity': learning_monitor.calculate_diversity(agents) if hasattr(learning_monitor, 'calculate_diversity') else 0,
+                'diversity': diversity,  # Calculada una sola vez arriba (aplana los pesos de toda la población)
                 'generation_time': 0,  # Se puede calcular si es necesario
                 'generation_time_ticks': tick  # Tiempo en ticks de esta generación
             }
@@ -480,7 +544,7 @@ def main():
             fitness_history.append(avg_fitness)
             
             # Registrar datos en el monitor de aprendizaje
-            gen_data = learning_monitor.record_generation(generation, agents, world)
+            gen_data = learning_monitor.record_generation(generation, agents, world, diversity=diversity)
             
             # Clustering (después de crear gen_data)
             if gen_data and gen_data.get('cluster_stats'):
@@ -504,19 +568,19 @@ def main():
 
             # Evolucionar
             agents = ga.evolve(agents, generation)
+            world.alive_agents_count = len(agents)
             
             # SISTEMA DE DETECCIÓN Y CORRECCIÓN DE POSICIONES INVÁLIDAS
             print("🔍 Verificando posiciones de agentes...")
             fix_agent_positions(world, agents)
             
             # Reposicionar agentes que spawnearon dentro de fortalezas O sobre obstáculos (después de evolucionar)
-            if config.FORTRESSES_ENABLED:
+            if fortresses_enabled:
                 
                 for agent in agents:
                     # Verificar si está dentro de fortalezas O sobre obstáculos
                     needs_repositioning = (world._is_inside_fortress(agent.x, agent.y) or 
-                                          any(obstacle.collides_with(agent.x, agent.y, agent.radius) 
-                                              for obstacle in world.obstacles))
+                                          world.hits_obstacle(agent.x, agent.y, agent.radius))
                     
                     if needs_repositioning:
                         # Reposicionar fuera de fortalezas, obstáculos Y zona de estadísticas
@@ -524,17 +588,14 @@ def main():
                         while attempts < 500:  # Más intentos para mayor seguridad
                             # Área de juego válida: solo pasto, excluyendo perímetro y panel de estadísticas
                             # Usar dimensiones escaladas dinámicamente
-                            new_x = random.randint(20, config.get_grass_area_width() - 20)  # Solo área de pasto, evitando perímetro
+                            new_x = random.randint(20, spawn_max_x)  # Solo área de pasto, evitando perímetro
                             new_y = random.randint(20, screen_height - 20)  # Evitando perímetro superior e inferior
                             
                             # Verificar que no esté en fortaleza Y no colisione con obstáculos Y no esté en perímetro Y no esté en estanque
                             if (not world._is_inside_fortress(new_x, new_y) and
-                                not any(obstacle.collides_with(new_x, new_y, agent.radius) 
-                                       for obstacle in world.obstacles) and
-                                not any(perimeter_obj.collides_with(new_x, new_y, agent.radius, agent.radius)
-                                       for perimeter_obj in world.perimeter_obstacles) and
-                                not any(pond_obj.collides_with(new_x, new_y, agent.radius, agent.radius)
-                                       for pond_obj in world.pond_obstacles)):
+                                not world.hits_obstacle(new_x, new_y, agent.radius) and
+                                not world.hits_perimeter(new_x, new_y, agent.radius, agent.radius) and
+                                not world.hits_pond(new_x, new_y, agent.radius, agent.radius)):
                                 agent.x = new_x
                                 agent.y = new_y
                                 break
@@ -548,10 +609,8 @@ def main():
                                 for test_y in [100, 200, 300, 400, 500, 600]:
                                     # Verificar que no esté en estanque
                                     safe_position = True
-                                    for pond_obj in world.pond_obstacles:
-                                        if pond_obj.collides_with(test_x, test_y, agent.radius, agent.radius):
-                                            safe_position = False
-                                            break
+                                    if world.hits_pond(test_x, test_y, agent.radius, agent.radius):
+                                        safe_position = False
                                     if safe_position:
                                         safe_x, safe_y = test_x, test_y
                                         break
@@ -586,65 +645,55 @@ def main():
             fix_agent_positions(world, agents)
         
         # Renderizar (solo si no está en modo headless)
-        if not config.HEADLESS_MODE:
-            render_surface.fill((40, 40, 60))  # Fondo azul oscuro
-            
+        if not headless_mode:
             # Dibujar fondo: pasto hasta el perímetro, agua después
-            for x in range(0, 960, 16):  # Área de juego fija (1200 - 240 panel)
-                for y in range(0, 800, 16):  # Alto fijo
-                    if x < 1200:  # Todo el área de juego debe ser pasto
-                        # Solo pasto con variación
-                        grass_variant = 1 if (x // 16 + y // 16) % 2 == 0 else 2
-                        grass_sprite = sprite_manager.get_environment_sprite('grass', grass_variant)
-                        render_surface.blit(grass_sprite, (x, y))
+            # (el damero es estático: se rasteriza una vez y cada frame es un único blit;
+            # el placeholder evita un blit de None si falta el asset)
+            grass_sprites = (sprite_manager.get_environment_sprite('grass', 1) or sprite_manager.missing_sprite,
+                             sprite_manager.get_environment_sprite('grass', 2) or sprite_manager.missing_sprite)
+            if background is None or grass_sprites != background_sprites:
+                background = _build_background(render_surface.get_size(), grass_sprites)
+                background_sprites = grass_sprites
+            render_surface.blit(background, (0, 0))
             
-            # Dibujar obstáculos con sprites
-            for obstacle in world.obstacles:
-                obstacle.draw(render_surface, sprite_manager, tick)
+            # Dibujar obstáculos con sprites (capa estática cacheada + agua animada)
+            world.draw_obstacles(render_surface, sprite_manager, tick)
             
-            # Dibujar perímetro decorativo
-            for perimeter_obj in world.perimeter_obstacles:
-                perimeter_obj.draw(render_surface, sprite_manager)
+            # Dibujar perímetro decorativo (superficie pre-renderizada)
+            world.draw_perimeter(render_surface, sprite_manager)
             
             # Dibujar estanque móvil
             for pond_obj in world.pond_obstacles:
                 pond_obj.draw(render_surface, sprite_manager, tick)
             
             # Dibujar hacha si existe y no fue agarrada
-            if config.TREE_CUTTING_ENABLED and world.axe and not world.axe['picked_up']:
+            if tree_cutting_enabled and world.axe and not world.axe['picked_up']:
                 axe_sprite = sprite_manager.get_environment_sprite('axe')
                 if axe_sprite:
-                    # Efecto de brillo pulsante
+                    # Efecto de brillo pulsante (halo y overlay ya construidos y convertidos por color)
                     glow_intensity = int(50 + 30 * abs(pygame.math.Vector2(1, 1).length() * 0.1 * tick % 1 - 0.5))
                     glow_color = (255, 255, 100 + glow_intensity)  # Amarillo brillante
+                    halos, bright_overlay = sprite_manager.get_glow_sprites('axe', glow_color)
                     
                     # Dibujar halo de brillo suave (sin fondo)
-                    for i in range(3):
-                        glow_radius = 15 + i * 5
-                        glow_alpha = 30 - i * 8  # Más transparente
-                        glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                        pygame.draw.circle(glow_surface, (*glow_color[:3], glow_alpha), 
-                                        (glow_radius, glow_radius), glow_radius)
+                    for glow_surface, glow_radius in halos:
                         render_surface.blit(glow_surface, (world.axe['x'] - glow_radius, world.axe['y'] - glow_radius))
                     
                     # Dibujar hacha original con brillo sutil
                     render_surface.blit(axe_sprite, (world.axe['x'] - 10, world.axe['y'] - 10))
                     
                     # Añadir brillo sutil encima (sin fondo)
-                    bright_overlay = pygame.Surface(axe_sprite.get_size(), pygame.SRCALPHA)
-                    bright_overlay.fill((*glow_color[:3], 30))  # Muy transparente
-                    bright_overlay.blit(axe_sprite, (0, 0), special_flags=pygame.BLEND_ADD)
                     render_surface.blit(bright_overlay, (world.axe['x'] - 10, world.axe['y'] - 10))
             
-            # Dibujar manzanas (comida)
-            for food in world.food_items:
-                if not food['eaten']:
-                    # Dibujar manzana con sprite
-                    apple_sprite = sprite_manager.get_environment_sprite('apple')
-                    render_surface.blit(apple_sprite, (int(food['x'] - 8), int(food['y'] - 8)))
+            # Dibujar manzanas (comida), todas en un único blits()
+            apple_sprite = sprite_manager.get_environment_sprite('apple') or sprite_manager.missing_sprite
+            render_surface.blits([
+                (apple_sprite, (int(food['x'] - 8), int(food['y'] - 8)))
+                for food in world.food_items if not food['eaten']
+            ], False)
             
             # Dibujar fortalezas, llaves, puertas y cofre (DESPUÉS de obstáculos para que se vean)
-            if config.FORTRESSES_ENABLED:
+            if fortresses_enabled:
                 # Dibujar puertas (encima de los muros)
                 if world.door:
                     world.door.draw(render_surface, sprite_manager, tick)
@@ -660,26 +709,19 @@ def main():
                     # Efecto de halo brillante para red_key (igual que el hacha)
                     red_key_sprite = sprite_manager.get_environment_sprite('red_key')
                     if red_key_sprite:
-                        # Efecto de brillo pulsante
+                        # Efecto de brillo pulsante (halo y overlay ya construidos y convertidos por color)
                         glow_intensity = int(50 + 30 * abs(pygame.math.Vector2(1, 1).length() * 0.1 * tick % 1 - 0.5))
                         glow_color = (255, 100, 100 + glow_intensity)  # Rojo brillante
+                        halos, bright_overlay = sprite_manager.get_glow_sprites('red_key', glow_color)
                         
                         # Dibujar halo de brillo suave (sin fondo)
-                        for i in range(3):
-                            glow_radius = 15 + i * 5
-                            glow_alpha = 30 - i * 8  # Más transparente
-                            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                            pygame.draw.circle(glow_surface, (*glow_color[:3], glow_alpha), 
-                                            (glow_radius, glow_radius), glow_radius)
+                        for glow_surface, glow_radius in halos:
                             render_surface.blit(glow_surface, (world.red_key.x - glow_radius, world.red_key.y - glow_radius))
                         
                         # Dibujar red_key original con brillo sutil
                         world.red_key.draw(render_surface, sprite_manager, tick)
                         
                         # Añadir brillo sutil encima (sin fondo)
-                        bright_overlay = pygame.Surface(red_key_sprite.get_size(), pygame.SRCALPHA)
-                        bright_overlay.fill((*glow_color[:3], 30))  # Muy transparente
-                        bright_overlay.blit(red_key_sprite, (0, 0), special_flags=pygame.BLEND_ADD)
                         render_surface.blit(bright_overlay, (world.red_key.x - 10, world.red_key.y - 10))
                     else:
                         # Fallback si no hay sprite
@@ -701,9 +743,10 @@ def main():
             if graves:
                 grave_sprite = sprite_manager.get_environment_sprite('grave')
                 if grave_sprite:
-                    for g in graves:
-                        rect = grave_sprite.get_rect(center=(g['x'], g['y']))
-                        render_surface.blit(grave_sprite, rect)
+                    # Centradas en la posición de muerte, todas en un único blits()
+                    half_w = grave_sprite.get_width() // 2
+                    half_h = grave_sprite.get_height() // 2
+                    render_surface.blits([(grave_sprite, (g['x'] - half_w, g['y'] - half_h)) for g in graves], False)
 
             # Dibujar agentes
             for agent in agents:
@@ -718,13 +761,12 @@ def main():
             # Dibujar cuadro de resumen (si está visible)
             summary_popup.draw(render_surface)
                         
-            if paused and pause_font:
-                pause_text = pause_font.render("PAUSADO - Presiona ESPACIO", True, (255, 0, 0))
+            if paused:
+                pause_text = render_text("PAUSADO - Presiona ESPACIO", 24, (255, 0, 0))
                 render_surface.blit(pause_text, (10, 40))
             
-            # Escalar y mostrar la superficie renderizada
-            scaled_surface = pygame.transform.scale(render_surface, (screen_width, screen_height))
-            display_screen.blit(scaled_surface, (0, 0))
+            # Escalar directamente sobre la ventana (sin superficie intermedia por frame)
+            pygame.transform.scale(render_surface, display_size, display_screen)
             
             # Actualizar pantalla
             pygame.display.flip()
@@ -888,11 +930,12 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
     if world.door_iron and world.door_iron.is_open:
         doors_opened += 1
     
-    # Configurar fuentes (más pequeñas, como el popup de generación)
-    font_large = pygame.font.Font(None, 48)   # Título principal
-    font_title = pygame.font.Font(None, 22)   # Secciones
-    font_medium = pygame.font.Font(None, 18)  # Subtítulos/ítems destacados
-    font_small = pygame.font.Font(None, 16)   # Texto
+    # Tamaños de fuente (más pequeños, como el popup de generación); los textos se
+    # rasterizan una vez con render_text y se reutilizan en cada frame de esta pantalla
+    font_large = 48   # Título principal
+    font_title = 22   # Secciones
+    font_medium = 18  # Subtítulos/ítems destacados
+    font_small = 16   # Texto
     
     # Colores
     BLACK = (0, 0, 0)
@@ -921,22 +964,21 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
                     render_surface.blit(grass_sprite, (x, y))
         
         # Dibujar obstáculos
-        for obstacle in world.obstacles:
-            obstacle.draw(render_surface, sprite_manager, tick)
+        world.draw_obstacles(render_surface, sprite_manager, tick)
         
         # Dibujar perímetro decorativo
-        for perimeter_obj in world.perimeter_obstacles:
-            perimeter_obj.draw(render_surface, sprite_manager)
+        world.draw_perimeter(render_surface, sprite_manager)
         
         # Dibujar estanque móvil
         for pond_obj in world.pond_obstacles:
             pond_obj.draw(render_surface, sprite_manager, tick)
         
         # Dibujar comida
-        for food in world.food_items:
-            if not food['eaten']:
-                apple_sprite = sprite_manager.get_environment_sprite('apple')
-                render_surface.blit(apple_sprite, (int(food['x'] - 8), int(food['y'] - 8)))
+        apple_sprite = sprite_manager.get_environment_sprite('apple') or sprite_manager.missing_sprite
+        render_surface.blits([
+            (apple_sprite, (int(food['x'] - 8), int(food['y'] - 8)))
+            for food in world.food_items if not food['eaten']
+        ], False)
         
         # Dibujar fortalezas, llaves, puertas y cofre
         if world.door:
@@ -1022,12 +1064,12 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
             title_color = BLUE
 
         # Título principal
-        title_text = font_large.render(title_label, True, title_color)
+        title_text = render_text(title_label, font_large, title_color)
         title_rect = title_text.get_rect(center=(panel_width // 2, 40))
         final_surface.blit(title_text, title_rect)
 
         # Subtítulo
-        subtitle_text = font_medium.render(subtitle_label, True, WHITE)
+        subtitle_text = render_text(subtitle_label, font_medium, WHITE)
         subtitle_rect = subtitle_text.get_rect(center=(panel_width // 2, 70))
         final_surface.blit(subtitle_text, subtitle_rect)
 
@@ -1074,7 +1116,7 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
             pygame.draw.line(chart_surface, grid_color,
                              (inner_left, y),
                              (inner_left + inner_width, y), 1)
-            label = font_small.render(f"{level}", True, (180, 180, 180))
+            label = render_text(f"{level}", font_small, (180, 180, 180))
             chart_surface.blit(label, (10, y - 8))
 
         avg_history = [d.get('avg_fitness', 0.0) for d in learning_monitor.generation_data] if learning_monitor.generation_data else []
@@ -1116,15 +1158,15 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
 
             # Etiquetas de generaciones (inicio y fin)
             if gen_count >= 1:
-                start_label = font_small.render("Gen 1", True, (180, 180, 180))
+                start_label = render_text("Gen 1", font_small, (180, 180, 180))
                 chart_surface.blit(start_label, (inner_left - start_label.get_width() // 2, inner_top + inner_height + 10))
-                end_label = font_small.render(f"Gen {gen_count}", True, (180, 180, 180))
+                end_label = render_text(f"Gen {gen_count}", font_small, (180, 180, 180))
                 chart_surface.blit(end_label, (inner_left + inner_width - end_label.get_width() // 2, inner_top + inner_height + 10))
 
         # Leyenda
         legend_y = 5
-        legend_avg = font_small.render("Promedio", True, avg_color)
-        legend_max = font_small.render("Máximo", True, max_color)
+        legend_avg = render_text("Promedio", font_small, avg_color)
+        legend_max = render_text("Máximo", font_small, max_color)
         chart_surface.blit(legend_avg, (inner_left + 10, legend_y))
         chart_surface.blit(legend_max, (inner_left + 120, legend_y))
 
@@ -1134,7 +1176,7 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
         y_pos = 110
 
         # Encabezado corto
-        gen_text = font_medium.render(f"Generación: {generation}", True, (100, 255, 150))
+        gen_text = render_text(f"Generación: {generation}", font_medium, (100, 255, 150))
         final_surface.blit(gen_text, (30, y_pos))
         
         # Tiempo total acumulado (minutos) estimado a partir del historial
@@ -1148,22 +1190,22 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
         if total_ticks == 0:
             total_ticks = tick
         total_minutes = total_ticks // 60 // 60
-        time_text = font_medium.render(f"Tiempo total: {total_minutes:.1f} min", True, (100, 255, 150))
+        time_text = render_text(f"Tiempo total: {total_minutes:.1f} min", font_medium, (100, 255, 150))
         final_surface.blit(time_text, (260, y_pos))
 
         y_pos += 28
 
         # 1) Objetivo y resultado
-        goal_title = font_title.render("OBJETIVO", True, (100, 255, 150))
+        goal_title = render_text("OBJETIVO", font_title, (100, 255, 150))
         final_surface.blit(goal_title, (30, y_pos))
         y_pos += 18
-        goal_line_1 = font_small.render("Objetivo: Abrir el cofre", True, (200, 200, 200))
-        goal_line_2 = font_small.render("Resultado: Completado", True, (200, 255, 200))
+        goal_line_1 = render_text("Objetivo: Abrir el cofre", font_small, (200, 200, 200))
+        goal_line_2 = render_text("Resultado: Completado", font_small, (200, 255, 200))
         final_surface.blit(goal_line_1, (40, y_pos)); y_pos += 18
         final_surface.blit(goal_line_2, (40, y_pos)); y_pos += 20
 
         # 2) Pasos clave del reto (checklist)
-        steps_title = font_title.render("PASOS CLAVE", True, (100, 255, 150))
+        steps_title = render_text("PASOS CLAVE", font_title, (100, 255, 150))
         final_surface.blit(steps_title, (30, y_pos))
         y_pos += 18
         step_red = "SI" if world.red_key_collected else "NO"
@@ -1171,15 +1213,15 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
         step_door_wood = "SI" if (world.door and world.door.is_open) else "NO"
         step_door_iron = "SI" if (world.door_iron and world.door_iron.is_open) else "NO"
         step_chest = "SI"  # Estamos en pantalla de FIN
-        steps_line_1 = font_small.render(f"Llave roja: {step_red}   Llave dorada: {step_gold}", True, (200, 200, 200))
-        steps_line_2 = font_small.render(f"Puerta madera: {step_door_wood}   Puerta hierro: {step_door_iron}", True, (200, 200, 200))
-        steps_line_3 = font_small.render(f"Cofre: {step_chest}", True, (200, 200, 200))
+        steps_line_1 = render_text(f"Llave roja: {step_red}   Llave dorada: {step_gold}", font_small, (200, 200, 200))
+        steps_line_2 = render_text(f"Puerta madera: {step_door_wood}   Puerta hierro: {step_door_iron}", font_small, (200, 200, 200))
+        steps_line_3 = render_text(f"Cofre: {step_chest}", font_small, (200, 200, 200))
         final_surface.blit(steps_line_1, (40, y_pos)); y_pos += 18
         final_surface.blit(steps_line_2, (40, y_pos)); y_pos += 18
         final_surface.blit(steps_line_3, (40, y_pos)); y_pos += 20
 
         # 3) ¿Aprendieron?
-        learned_title = font_title.render("¿APRENDIERON?", True, (100, 255, 150))
+        learned_title = render_text("¿APRENDIERON?", font_title, (100, 255, 150))
         final_surface.blit(learned_title, (30, y_pos))
         y_pos += 18
         
@@ -1204,24 +1246,24 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
             initial_avg_fitness = avg_fitness
             final_avg_fitness = avg_fitness
         
-        learn_line_1 = font_small.render(f"Mejoraron con el tiempo: {improved_flag}", True, (200, 200, 200))
-        learn_line_2 = font_small.render(f"Antes vs ahora (fitness prom): {initial_avg_fitness:.1f} → {final_avg_fitness:.1f}", True, (200, 200, 200))
-        learn_line_3 = font_small.render(f"Exploraron más: {explored_more_flag}", True, (200, 200, 200))
+        learn_line_1 = render_text(f"Mejoraron con el tiempo: {improved_flag}", font_small, (200, 200, 200))
+        learn_line_2 = render_text(f"Antes vs ahora (fitness prom): {initial_avg_fitness:.1f} → {final_avg_fitness:.1f}", font_small, (200, 200, 200))
+        learn_line_3 = render_text(f"Exploraron más: {explored_more_flag}", font_small, (200, 200, 200))
         final_surface.blit(learn_line_1, (40, y_pos)); y_pos += 18
         final_surface.blit(learn_line_2, (40, y_pos)); y_pos += 18
         final_surface.blit(learn_line_3, (40, y_pos)); y_pos += 20
 
         # 4) Línea de tiempo mínima
-        timeline_title = font_title.render("LÍNEA DE TIEMPO", True, (100, 255, 150))
+        timeline_title = render_text("LÍNEA DE TIEMPO", font_title, (100, 255, 150))
         final_surface.blit(timeline_title, (30, y_pos))
         y_pos += 18
-        timeline_line_1 = font_small.render(f"Primera vez con cofre abierto: Gen {first_chest_gen}", True, (200, 200, 200))
-        timeline_line_2 = font_small.render(f"Tiempo total de simulación: {total_minutes:.1f} min", True, (200, 200, 200))
+        timeline_line_1 = render_text(f"Primera vez con cofre abierto: Gen {first_chest_gen}", font_small, (200, 200, 200))
+        timeline_line_2 = render_text(f"Tiempo total de simulación: {total_minutes:.1f} min", font_small, (200, 200, 200))
         final_surface.blit(timeline_line_1, (40, y_pos)); y_pos += 18
         final_surface.blit(timeline_line_2, (40, y_pos)); y_pos += 20
 
         # 5) Top agente (ID corto)
-        top_title = font_title.render("TOP AGENTE", True, (100, 255, 150))
+        top_title = render_text("TOP AGENTE", font_title, (100, 255, 150))
         final_surface.blit(top_title, (30, y_pos))
         y_pos += 18
         top_agent = max(agents, key=lambda a: a.fitness) if agents else None
@@ -1230,14 +1272,14 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
             short_id = f"#{raw_id[-4:]}" if len(raw_id) > 4 else f"#{raw_id}"
             top_km = top_agent.distance_traveled/100/1000  # px -> m -> km (1px=1cm)
             top_fitness_capped = min(100.0, getattr(top_agent, 'fitness', 0.0))
-            top_line = font_small.render(
+            top_line = render_text(
                 f"Agente {short_id}: fitness {top_fitness_capped:.1f}, comida {top_agent.food_eaten} manzanas, recorrio {top_km:.2f} km",
-                True, (200, 200, 200)
+                font_small, (200, 200, 200)
             )
             final_surface.blit(top_line, (40, y_pos)); y_pos += 20
 
         # 6) Sello de movimiento
-        move_title = font_title.render("MOVIMIENTO", True, (100, 255, 150))
+        move_title = render_text("MOVIMIENTO", font_title, (100, 255, 150))
         final_surface.blit(move_title, (30, y_pos))
         y_pos += 18
         try:
@@ -1245,11 +1287,11 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
             movement_flag = "Mas recto y con menos vueltas" if avg_sr >= 0.5 else "Aun con vueltas"
         except Exception:
             movement_flag = "Aun con vueltas"
-        move_line = font_small.render(movement_flag, True, (200, 200, 200))
+        move_line = render_text(movement_flag, font_small, (200, 200, 200))
         final_surface.blit(move_line, (40, y_pos)); y_pos += 20
 
         # 7) Clustering (última generación)
-        cluster_title = font_title.render("CLUSTERING", True, (100, 255, 150))
+        cluster_title = render_text("CLUSTERING", font_title, (100, 255, 150))
         final_surface.blit(cluster_title, (30, y_pos))
         y_pos += 18
         
@@ -1275,35 +1317,34 @@ def show_final_screen(render_surface, generation, tick, agents, world, learning_
                 
                 for strategy, count, percentage, fitness in sorted_clusters[:3]:
                     cluster_text = f"{strategy}: {percentage:.1f}% ({count} agentes, fit {fitness:.1f})"
-                    cluster_line = font_small.render(cluster_text, True, (200, 200, 200))
+                    cluster_line = render_text(cluster_text, font_small, (200, 200, 200))
                     final_surface.blit(cluster_line, (40, y_pos))
                     y_pos += 18
             else:
-                no_cluster_line = font_small.render("No disponible (pocos agentes)", True, (150, 150, 150))
+                no_cluster_line = render_text("No disponible (pocos agentes)", font_small, (150, 150, 150))
                 final_surface.blit(no_cluster_line, (40, y_pos))
                 y_pos += 18
         except Exception as e:
-            error_line = font_small.render("Error en clustering", True, (150, 150, 150))
+            error_line = render_text("Error en clustering", font_small, (150, 150, 150))
             final_surface.blit(error_line, (40, y_pos))
             y_pos += 18
         
         y_pos += 8
 
         # Mensaje final + instrucciones
-        final_text = font_medium.render("¡Los agentes evolutivos han completado su misión!", True, (100, 255, 150))
+        final_text = render_text("¡Los agentes evolutivos han completado su misión!", font_medium, (100, 255, 150))
         final_rect = final_text.get_rect(center=(panel_width // 2, y_pos))
         final_surface.blit(final_text, final_rect)
         y_pos += 26
-        instructions_text = font_small.render("Presiona ESC o ENTER para salir", True, (220, 220, 220))
+        instructions_text = render_text("Presiona ESC o ENTER para salir", font_small, (220, 220, 220))
         instructions_rect = instructions_text.get_rect(center=(panel_width // 2, y_pos))
         final_surface.blit(instructions_text, instructions_rect)
 
         # Dibujar el panel sobre la simulación
         render_surface.blit(final_surface, (panel_x, panel_y))
         
-        # Escalar y mostrar la superficie renderizada
-        scaled_surface = pygame.transform.scale(render_surface, (screen_width, screen_height))
-        display_screen.blit(scaled_surface, (0, 0))
+        # Escalar directamente sobre la ventana (sin superficie intermedia por frame)
+        pygame.transform.scale(render_surface, display_screen.get_size(), display_screen)
         
         pygame.display.flip()
     
@@ -14,10 +14,48 @@ from collections import deque
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from config import SimulationConfig
 
+# Constante angular precalculada (los cálculos escalares usan math, no ufuncs de numpy)
+_TWO_PI = math.tau
+
+# Generador numpy propio (PCG64) para pesos, mutación y cruza de las redes
+_rng = np.random.default_rng()
+
+# Ruido de exploración servido desde bloques generados de una vez (una llamada numpy cada ~1365 ticks de agente)
+_NOISE_BLOCK_SIZE = 4096
+_noise_block = []
+_noise_pos = 0
+
+
+def _exploration_noise():
+    """Devuelve tres perturbaciones uniformes en [-1, 1) tomadas del bloque precalculado."""
+    global _noise_block, _noise_pos
+    pos = _noise_pos
+    if pos + 3 > len(_noise_block):
+        # Reponer el bloque completo en una sola llamada (floats de Python, sin escalares numpy)
+        _noise_block = _rng.uniform(-1.0, 1.0, _NOISE_BLOCK_SIZE).tolist()
+        pos = 0
+    _noise_pos = pos + 3
+    return _noise_block[pos], _noise_block[pos + 1], _noise_block[pos + 2]
+
+
+def _wrap_angle(angle):
+    """Normaliza un ángulo a [-pi, pi] en una sola operación (sin bucles, aunque el ángulo acumulado sea grande)."""
+    return math.remainder(angle, _TWO_PI)
+
 
 class AdvancedAgent:
     """Agente avanzado con cerebro, sensores y actuadores."""
     
+    # Color del anillo de fitness por punto entero (0-100): rojo <25, naranja <50, amarillo <75, verde
+    FITNESS_COLOR_LUT = tuple(
+        (255, 0, 0) if i < 25 else (255, 165, 0) if i < 50 else (255, 255, 0) if i < 75 else (0, 255, 0)
+        for i in range(101)
+    )
+    
+    # Tamaño del sprite en pantalla y desplazamiento para centrarlo (sin crear un Rect por agente)
+    SPRITE_SIZE = (16, 16)
+    SPRITE_HALF = (SPRITE_SIZE[0] // 2, SPRITE_SIZE[1] // 2)
+    
     def __init__(self, x, y, brain=None):
         # Identificador único
         self.id = id(self)  # Usar el id del objeto Python como identificador único
@@ -25,7 +63,7 @@ class AdvancedAgent:
         # Posición y movimiento
         self.x = float(x)
         self.y = float(y)
-        self.angle = random.uniform(0, 2 * np.pi)
+        self.angle = random.uniform(0, _TWO_PI)
         self.speed = SimulationConfig.AGENT_SPEED  # Velocidad desde config
         self.radius = 8
         
@@ -48,7 +86,7 @@ class AdvancedAgent:
         
         # Sensores
         self.vision_range = 150
-        self.vision_angle = np.pi / 3  # 60 grados
+        self.vision_angle = math.pi / 3  # 60 grados
         
         # Actuadores
         self.moving = False
@@ -71,6 +109,10 @@ class AdvancedAgent:
         self.recent_angles = deque(maxlen=window)
         self.recent_cells = deque(maxlen=window)
         self.recent_step_distances = deque(maxlen=window)
+        # Sumas acumuladas de la ventana (se actualizan al entrar/salir cada muestra, sin recorrerla)
+        self._window_path = 0.0  # Longitud del recorrido entre posiciones consecutivas
+        self._window_turn = 0.0  # Suma de |giro| entre ángulos consecutivos
+        self._window_cells = {}  # Celda -> apariciones en la ventana
         self.metric_sr = 0.0
         self.metric_turn_smooth = 1.0
         self.metric_novelty = 0.0
@@ -98,7 +140,7 @@ class AdvancedAgent:
         # 2. Distancia a la comida más cercana
         nearest_food = self._find_nearest_food(world)
         if nearest_food:
-            nearest_food_dist = float(np.sqrt((float(self.x) - nearest_food[0])**2 + (float(self.y) - nearest_food[1])**2))
+            nearest_food_dist = float(math.sqrt((float(self.x) - nearest_food[0])**2 + (float(self.y) - nearest_food[1])**2))
         else:
             nearest_food_dist = self.vision_range
         perceptions.append(min(nearest_food_dist / self.vision_range, 1.0))
@@ -107,14 +149,11 @@ class AdvancedAgent:
         if nearest_food:
             dx = nearest_food[0] - float(self.x)
             dy = nearest_food[1] - float(self.y)
-            target_angle = float(np.arctan2(dy, dx))
+            target_angle = float(math.atan2(dy, dx))
             angle_diff = target_angle - self.angle
             # Normalizar ángulo
-            while angle_diff > np.pi:
-                angle_diff -= 2 * np.pi
-            while angle_diff < -np.pi:
-                angle_diff += 2 * np.pi
-            perceptions.append(angle_diff / np.pi)  # Normalizar a [-1, 1]
+            angle_diff = _wrap_angle(angle_diff)
+            perceptions.append(angle_diff / math.pi)  # Normalizar a [-1, 1]
         else:
             perceptions.append(0.0)
         
@@ -127,7 +166,7 @@ class AdvancedAgent:
                 dist_sq = dx*dx + dy*dy  # Comparar sin sqrt
                 min_obstacle_dist_sq = min(min_obstacle_dist_sq, dist_sq)
         # Calcular sqrt solo una vez al final si es necesario
-        min_obstacle_dist = float(np.sqrt(min_obstacle_dist_sq)) if min_obstacle_dist_sq != float('inf') else float('inf')
+        min_obstacle_dist = float(math.sqrt(min_obstacle_dist_sq)) if min_obstacle_dist_sq != float('inf') else float('inf')
         perceptions.append(min(min_obstacle_dist / self.vision_range, 1.0) if min_obstacle_dist != float('inf') else 1.0)
         
         # 5. Posición X normalizada
@@ -137,7 +176,7 @@ class AdvancedAgent:
         perceptions.append(self.y / world.screen_height)
         
         # 7. Ángulo actual normalizado
-        perceptions.append(self.angle / (2 * np.pi))
+        perceptions.append(self.angle / _TWO_PI)
         
         # 8. Estado combinado de llaves (0=ninguna, 0.5=una, 1=ambas)
         red_key_collected = 1.0 if (hasattr(world, 'red_key_collected') and world.red_key_collected) else 0.0
@@ -152,8 +191,7 @@ class AdvancedAgent:
         perceptions.append(door_status)
         
         # 10. Ratio de comida disponible
-        from config import SimulationConfig
-        available_food = len([f for f in world.food_items if not f['eaten']])
+        available_food = world.food_remaining
         food_ratio = available_food / SimulationConfig.FOOD_COUNT if SimulationConfig.FOOD_COUNT > 0 else 0.0
         perceptions.append(min(food_ratio, 1.0))
         
@@ -174,14 +212,11 @@ class AdvancedAgent:
             if food_ratio < 0.6 and has_axe > 0.5:
                 nearest_tree = self._find_nearest_cuttable_tree(world)
                 if nearest_tree:
-                    target_angle = float(np.arctan2(nearest_tree[1] - float(self.y), nearest_tree[0] - float(self.x)))
+                    target_angle = float(math.atan2(nearest_tree[1] - float(self.y), nearest_tree[0] - float(self.x)))
                     angle_diff = target_angle - self.angle
                     
                     # Normalizar ángulo
-                    while angle_diff > np.pi:
-                        angle_diff -= 2 * np.pi
-                    while angle_diff < -np.pi:
-                        angle_diff += 2 * np.pi
+                    angle_diff = _wrap_angle(angle_diff)
                     
                     # Movimiento hacia árbol
                     if abs(angle_diff) < 0.3:
@@ -198,14 +233,11 @@ class AdvancedAgent:
                     nearest_food = self._find_nearest_food(world)
                     if nearest_food:
                         self.target_food = nearest_food
-                        target_angle = float(np.arctan2(nearest_food[1] - float(self.y), nearest_food[0] - float(self.x)))
+                        target_angle = float(math.atan2(nearest_food[1] - float(self.y), nearest_food[0] - float(self.x)))
                         angle_diff = target_angle - self.angle
                         
                         # Normalizar ángulo
-                        while angle_diff > np.pi:
-                            angle_diff -= 2 * np.pi
-                        while angle_diff < -np.pi:
-                            angle_diff += 2 * np.pi
+                        angle_diff = _wrap_angle(angle_diff)
                         
                         # Movimiento más directo hacia el objetivo
                         if abs(angle_diff) < 0.3:  # Casi alineado
@@ -225,14 +257,11 @@ class AdvancedAgent:
                 if nearest_food:
                     # Guardar objetivo para mostrar línea amarilla
                     self.target_food = nearest_food
-                    target_angle = float(np.arctan2(nearest_food[1] - float(self.y), nearest_food[0] - float(self.x)))
+                    target_angle = float(math.atan2(nearest_food[1] - float(self.y), nearest_food[0] - float(self.x)))
                     angle_diff = target_angle - self.angle
                     
                     # Normalizar ángulo
-                    while angle_diff > np.pi:
-                        angle_diff -= 2 * np.pi
-                    while angle_diff < -np.pi:
-                        angle_diff += 2 * np.pi
+                    angle_diff = _wrap_angle(angle_diff)
                     
                     # Movimiento más directo hacia el objetivo
                     if abs(angle_diff) < 0.3:  # Casi alineado
@@ -261,14 +290,11 @@ class AdvancedAgent:
         if self.fitness > puzzle_threshold_door and random.random() < puzzle_guidance_probability:
             nearest_door = self._find_nearest_door(world)
             if nearest_door:
-                target_angle = float(np.arctan2(nearest_door[1] - float(self.y), nearest_door[0] - float(self.x)))
+                target_angle = float(math.atan2(nearest_door[1] - float(self.y), nearest_door[0] - float(self.x)))
                 angle_diff = target_angle - self.angle
                 
                 # Normalizar ángulo
-                while angle_diff > np.pi:
-                    angle_diff -= 2 * np.pi
-                while angle_diff < -np.pi:
-                    angle_diff += 2 * np.pi
+                angle_diff = _wrap_angle(angle_diff)
                 
                 # Movimiento hacia puerta (menos agresivo: solo influencia sutil)
                 if abs(angle_diff) < 0.3:
@@ -285,14 +311,11 @@ class AdvancedAgent:
         if self.fitness > puzzle_threshold_key and random.random() < puzzle_guidance_probability:
             nearest_key = self._find_nearest_key(world)
             if nearest_key:
-                target_angle = float(np.arctan2(nearest_key[1] - float(self.y), nearest_key[0] - float(self.x)))
+                target_angle = float(math.atan2(nearest_key[1] - float(self.y), nearest_key[0] - float(self.x)))
                 angle_diff = target_angle - self.angle
                 
                 # Normalizar ángulo
-                while angle_diff > np.pi:
-                    angle_diff -= 2 * np.pi
-                while angle_diff < -np.pi:
-                    angle_diff += 2 * np.pi
+                angle_diff = _wrap_angle(angle_diff)
                 
                 # Movimiento hacia llave/cofre (menos agresivo: solo influencia sutil)
                 if abs(angle_diff) < 0.3:
@@ -318,14 +341,15 @@ class AdvancedAgent:
         
         # Agregar exploración continua pero reducida (MEJORADO)
         exploration_factor = 0.02  # Reducido de 0.08 a 0.02 para movimiento más dirigido
-        decisions['move_forward'] += random.uniform(-exploration_factor, exploration_factor)
-        decisions['turn_left'] += random.uniform(-exploration_factor, exploration_factor)
-        decisions['turn_right'] += random.uniform(-exploration_factor, exploration_factor)
+        noise_forward, noise_left, noise_right = _exploration_noise()
+        decisions['move_forward'] += noise_forward * exploration_factor
+        decisions['turn_left'] += noise_left * exploration_factor
+        decisions['turn_right'] += noise_right * exploration_factor
         
         # Agregar movimiento aleatorio ocasional para romper patrones (REDUCIDO)
         if random.random() < 0.02:  # Reducido de 10% a 2% para menos aleatoriedad
             # Movimiento en línea recta aleatoria
-            random_direction = random.uniform(0, 2 * np.pi)
+            random_direction = random.uniform(0, _TWO_PI)
             self.angle = random_direction
             decisions['move_forward'] += 0.2  # Reducido de 0.3 a 0.2
         
@@ -370,10 +394,7 @@ class AdvancedAgent:
             for i in range(1, len(angles_list)):
                 delta = angles_list[i] - angles_list[i-1]
                 # Normalizar a [-pi, pi]
-                while delta > math.pi:
-                    delta -= 2 * math.pi
-                while delta < -math.pi:
-                    delta += 2 * math.pi
+                delta = _wrap_angle(delta)
                 angle_changes.append(abs(delta))
             
             # Si hay giro constante (suma de cambios > umbral), penalizar
@@ -398,23 +419,22 @@ class AdvancedAgent:
         self.moving = False
         if decisions['move_forward'] > 0.5:
             angle_float = float(self.angle)
-            dx = float(np.cos(angle_float) * self.speed * decisions['move_forward'])
-            dy = float(np.sin(angle_float) * self.speed * decisions['move_forward'])
+            step = self.speed * decisions['move_forward']
+            dx = float(math.cos(angle_float) * step)
+            dy = float(math.sin(angle_float) * step)
             
             new_x = self.x + dx
             new_y = self.y + dy
             
             # Verificar colisiones con obstáculos y puertas
-            can_move = not self._check_obstacle_collision(new_x, new_y, world.obstacles)
+            can_move = not self._check_obstacle_collision(new_x, new_y, world)
             if can_move:
                 can_move = not self._check_door_collision(new_x, new_y, world)
             
             # Verificar colisión con perímetro
             if can_move:
-                for perimeter_obj in world.perimeter_obstacles:
-                    if perimeter_obj.collides_with(new_x, new_y, self.radius, self.radius):
-                        can_move = False
-                        break
+                if world.hits_perimeter(new_x, new_y, self.radius, self.radius):
+                    can_move = False
             
             # Verificar colisión con puertas
             if can_move:
@@ -426,10 +446,8 @@ class AdvancedAgent:
             
             # Verificar colisión con estanque
             if can_move:
-                for pond_obj in world.pond_obstacles:
-                    if pond_obj.collides_with(new_x, new_y, self.radius, self.radius):
-                        can_move = False
-                        break
+                if world.hits_pond(new_x, new_y, self.radius, self.radius):
+                    can_move = False
             
             if can_move:
                 # Mantener dentro de la pantalla
@@ -437,7 +455,7 @@ class AdvancedAgent:
                 new_y = max(self.radius, min(world.screen_height - self.radius, new_y))
                 
                 # Calcular distancia recorrida
-                move_distance = float(np.sqrt((float(new_x) - float(self.x))**2 + (float(new_y) - float(self.y))**2))
+                move_distance = float(math.sqrt((float(new_x) - float(self.x))**2 + (float(new_y) - float(self.y))**2))
                 self.distance_traveled += move_distance
                 self.movement_distance += move_distance
                 self.total_moves += 1
@@ -472,15 +490,13 @@ class AdvancedAgent:
         # Morir si no hay energía
         if self.energy <= 0:
             self.alive = False
+            world.agent_died()
             self.death_effect_frames = self.death_effect_max_frames
             self.target_food = None  # Limpiar objetivo al morir
     
-    def _check_obstacle_collision(self, x, y, obstacles):
+    def _check_obstacle_collision(self, x, y, world):
         """Verifica colisión con obstáculos (paredes, árboles, casitas y puertas). El agua NO tiene colisión."""
-        for obstacle in obstacles:
-            if obstacle.type in ["wall", "tree", "hut"] and obstacle.collides_with(x, y, self.radius):
-                return True
-        return False
+        return bool(world.obstacle_collision_mask(x, y, self.radius, blocking_only=True).any())
     
     def _check_door_collision(self, x, y, world):
         """Verifica colisión con puertas (incluyendo el espacio reducido cuando están abiertas)."""
@@ -496,45 +512,37 @@ class AdvancedAgent:
     
     def _check_zone_effects(self, world):
         """Verifica efectos de zonas especiales."""
-        for obstacle in world.obstacles:
-            if obstacle.type in ["water", "safe"] and obstacle.collides_with(self.x, self.y, self.radius):
-                effect = obstacle.get_effect()
-                
-                # Aplicar efectos de energía
-                if "energy_loss" in effect:
-                    self.energy -= effect["energy_loss"]
-                elif "energy_gain" in effect:
-                    self.energy = min(self.max_energy, self.energy + effect["energy_gain"])
-                
-                # Acumular penalización de fitness (no sobrescribir cálculo)
-                if "fitness_loss" in effect:
-                    self.fitness_env_penalty = max(0.0, self.fitness_env_penalty + effect["fitness_loss"])
-                
-                # Aplicar efectos de velocidad
-                if "speed_reduction" in effect:
-                    self.speed = max(1.0, self.speed * effect["speed_reduction"])
-                elif "speed_boost" in effect:
-                    self.speed = min(4.0, self.speed * effect["speed_boost"])
+        for obstacle in world.zone_obstacles(self.x, self.y, self.radius):
+            energy_loss, speed_factor, fitness_loss = obstacle.get_effect()
+            
+            # Aplicar efectos de energía (pérdida negativa = ganancia, limitada al máximo)
+            if energy_loss >= 0:
+                self.energy -= energy_loss
+            else:
+                self.energy = min(self.max_energy, self.energy - energy_loss)
+            
+            # Acumular penalización de fitness (no sobrescribir cálculo)
+            if fitness_loss:
+                self.fitness_env_penalty = max(0.0, self.fitness_env_penalty + fitness_loss)
+            
+            # Aplicar efectos de velocidad
+            if speed_factor <= 1.0:
+                self.speed = max(1.0, self.speed * speed_factor)
+            else:
+                self.speed = min(4.0, self.speed * speed_factor)
     
     def _try_eat(self, world):
         """Intenta comer comida cercana."""
-        for food in world.food_items:
-            if not food['eaten']:
-                # Convertir coordenadas a float para evitar problemas con NumPy
-                x_float = float(self.x)
-                y_float = float(self.y)
-                food_x = float(food['x'])
-                food_y = float(food['y'])
-                
-                dist = float(np.sqrt((x_float - food_x)**2 + (y_float - food_y)**2))
-                
-                if dist < 20:  # Rango MÁS grande para comer (AUMENTADO)
-                    food['eaten'] = True
-                    self.energy = min(self.max_energy, self.energy + 30)
-                    self.food_eaten += 1
-                    # Actualizar fitness en tiempo real para feedback visual
-                    self._calculate_fitness()
-                    return True
+        distances, items = world.food_distances(float(self.x), float(self.y))
+        in_range = np.flatnonzero(distances < 20)  # Rango MÁS grande para comer (AUMENTADO)
+        if in_range.size:
+            # La primera en el orden de la lista, igual que el recorrido secuencial
+            world.eat_food(items[in_range[0]])
+            self.energy = min(self.max_energy, self.energy + 30)
+            self.food_eaten += 1
+            # Actualizar fitness en tiempo real para feedback visual
+            self._calculate_fitness()
+            return True
         return False
     
     def _try_pickup_axe(self, world):
@@ -559,7 +567,6 @@ class AdvancedAgent:
         # Intentar golpear huts
         if world.process_hut_hit(self.x, self.y, current_tick):
             # Recompensa por destruir hut
-            from config import SimulationConfig
             self.fitness += SimulationConfig.HUT_CUT_REWARD  # Usar config
             # Actualizar cooldown del agente
             self.last_tree_hit_tick = current_tick
@@ -604,34 +611,26 @@ class AdvancedAgent:
     
     def _try_heal(self, world):
         """Intenta usar pociones para curarse."""
-        for obstacle in world.obstacles:
+        for obstacle in world.obstacles_near(self.x, self.y, 20):
             if obstacle.type == "potion":
-                distance = float(((float(self.x) - float(obstacle.x))**2 + (float(self.y) - float(obstacle.y))**2)**0.5)
-                if distance < 20:  # Rango de usar poción
+                dx = float(self.x) - float(obstacle.x)
+                dy = float(self.y) - float(obstacle.y)
+                if dx*dx + dy*dy < 20 * 20:  # Rango de usar poción (distancia² sin sqrt)
                     # Curar completamente
                     self.energy = 100
                     self.health = 100
                     # Remover la poción (opcional)
-                    world.obstacles.remove(obstacle)
+                    world.remove_obstacle(obstacle)
                     return True
         return False
     
     def _find_nearest_food(self, world):
         """Encuentra la comida más cercana."""
-        min_distance_sq = float('inf')  # Usar distancia² para comparación (sin sqrt)
-        nearest_food = None
-        
-        for food in world.food_items:
-            if not food['eaten']:
-                # Comparar usando distancia² (más rápido, sin sqrt)
-                dx = float(self.x) - food['x']
-                dy = float(self.y) - food['y']
-                distance_sq = dx*dx + dy*dy
-                if distance_sq < min_distance_sq:
-                    min_distance_sq = distance_sq
-                    nearest_food = (food['x'], food['y'])
-        
-        return nearest_food
+        distances, items = world.food_distances(float(self.x), float(self.y))
+        if not items:
+            return None
+        food = items[int(distances.argmin())]
+        return (food['x'], food['y'])
     
     def _find_nearest_cuttable_tree(self, world):
         """Encuentra el árbol más cercano que se puede cortar."""
@@ -736,10 +735,10 @@ class AdvancedAgent:
         survival_fitness = min(self.age * survival_multiplier, 10)
         
         # Fitness por comida (crece naturalmente con sqrt para evitar explosión)
-        food_fitness = food_multiplier * float(np.sqrt(max(0.0, float(self.food_eaten))))
+        food_fitness = food_multiplier * float(math.sqrt(max(0.0, float(self.food_eaten))))
         
         # Fitness por exploración (crece naturalmente con log para evitar explosión)
-        exploration_fitness = exploration_multiplier * float(np.log1p(max(0.0, float(self.distance_traveled)) / 350.0))
+        exploration_fitness = exploration_multiplier * float(math.log1p(max(0.0, float(self.distance_traveled)) / 350.0))
         exploration_fitness = min(exploration_fitness, 15.0)  # Límite aumentado de 15.0 a 18.0
         
         # Fitness por evitar obstáculos (solo si el agente tiene un fitness base decente)
@@ -786,55 +785,61 @@ class AdvancedAgent:
         return self.fitness
 
     def _update_movement_metrics(self, move_distance: float):
-        """Actualiza ventanas y métricas anti-círculo después de cada movimiento."""
-        # Registrar posición/ángulo y distancia de paso
-        self.recent_positions.append((float(self.x), float(self.y)))
-        self.recent_angles.append(float(self.angle))
-        self.recent_step_distances.append(float(move_distance))
-
+        """Actualiza ventanas y métricas anti-círculo después de cada movimiento (O(1) por paso)."""
+        positions = self.recent_positions
+        angles = self.recent_angles
+        cells = self.recent_cells
+        x, y, angle = float(self.x), float(self.y), float(self.angle)
         cell_size = int(getattr(SimulationConfig, 'NOVELTY_CELL_SIZE', 16))
         cell = (int(self.x) // cell_size, int(self.y) // cell_size)
-        self.recent_cells.append(cell)
+
+        # Descontar el tramo/giro/celda que sale de la ventana cuando está llena
+        if len(positions) == positions.maxlen:
+            (x0, y0), (x1, y1) = positions[0], positions[1]
+            self._window_path -= math.hypot(x1 - x0, y1 - y0)
+        if len(angles) == angles.maxlen:
+            self._window_turn -= abs(_wrap_angle(angles[1] - angles[0]))
+        if len(cells) == cells.maxlen:
+            old_cell = cells[0]
+            remaining = self._window_cells[old_cell] - 1
+            if remaining:
+                self._window_cells[old_cell] = remaining
+            else:
+                del self._window_cells[old_cell]
+
+        # Sumar el tramo/giro/celda que entra
+        if positions:
+            px, py = positions[-1]
+            self._window_path += math.hypot(x - px, y - py)
+        if angles:
+            self._window_turn += abs(_wrap_angle(angle - angles[-1]))
+        self._window_cells[cell] = self._window_cells.get(cell, 0) + 1
+
+        # Registrar posición/ángulo y distancia de paso
+        positions.append((x, y))
+        angles.append(angle)
+        self.recent_step_distances.append(float(move_distance))
+        cells.append(cell)
 
         # Straightness ratio
-        if len(self.recent_positions) >= 2:
-            x0, y0 = self.recent_positions[0]
-            xN, yN = self.recent_positions[-1]
-            net_displacement = float(np.hypot(xN - x0, yN - y0))
-            total_path = 0.0
-            px, py = self.recent_positions[0]
-            for (qx, qy) in list(self.recent_positions)[1:]:
-                total_path += float(np.hypot(qx - px, qy - py))
-                px, py = qx, qy
+        if len(positions) >= 2:
+            x0, y0 = positions[0]
+            net_displacement = math.hypot(x - x0, y - y0)
+            total_path = self._window_path
             self.metric_sr = 0.0 if total_path <= 1e-6 else max(0.0, min(1.0, net_displacement / total_path))
         else:
             self.metric_sr = 0.0
 
         # Giro medio absoluto normalizado (1 = muy recto, 0 = giro fuerte)
-        if len(self.recent_angles) >= 2:
-            deltas = []
-            prev = self.recent_angles[0]
-            for a in list(self.recent_angles)[1:]:
-                d = a - prev
-                # normalizar a [-pi, pi]
-                while d > math.pi:
-                    d -= 2 * math.pi
-                while d < -math.pi:
-                    d += 2 * math.pi
-                deltas.append(abs(d))
-                prev = a
-            mean_abs = float(np.mean(deltas)) if deltas else 0.0
+        if len(angles) >= 2:
+            mean_abs = self._window_turn / (len(angles) - 1)
             tmax = float(getattr(SimulationConfig, 'TURN_MEAN_ABS_MAX', 0.2))
             self.metric_turn_smooth = 1.0 - max(0.0, min(1.0, mean_abs / max(tmax, 1e-6)))
         else:
             self.metric_turn_smooth = 1.0
 
         # Novedad espacial en la ventana
-        denom = len(self.recent_cells)
-        if denom > 0:
-            self.metric_novelty = len(set(self.recent_cells)) / float(denom)
-        else:
-            self.metric_novelty = 0.0
+        self.metric_novelty = len(self._window_cells) / float(len(cells))
     
     def get_movement_skill(self):
         """Calcula el porcentaje de habilidad de movimiento."""
@@ -870,48 +875,53 @@ class AdvancedAgent:
             self._draw_death_effect(screen, tick)
             return
         
+        # Coordenadas de pantalla calculadas una sola vez y compartidas por todas las capas
+        cx = int(self.x)
+        cy = int(self.y)
+        center = (cx, cy)
+        
         # Obtener sprite del agente escalado (con cache para mejor rendimiento)
-        scaled_sprite = sprite_manager.get_scaled_agent_sprite(self.angle, tick, self.moving, (16, 16))
+        scaled_sprite = sprite_manager.get_scaled_agent_sprite(self.angle, tick, self.moving, self.SPRITE_SIZE)
         
         if scaled_sprite:
-            sprite_rect = scaled_sprite.get_rect(center=(int(self.x), int(self.y)))
-            screen.blit(scaled_sprite, sprite_rect)
+            half_w, half_h = self.SPRITE_HALF
+            screen.blit(scaled_sprite, (cx - half_w, cy - half_h))
         else:
             # Fallback mejorado: agente más nítido
             color_intensity = int(255 * (self.energy / self.max_energy))
             base_color = (color_intensity, 255 - color_intensity, 0)
             
             # Dibujar agente como círculo nítido
-            pygame.draw.circle(screen, base_color, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.radius, 2)
+            pygame.draw.circle(screen, base_color, center, self.radius)
+            pygame.draw.circle(screen, (255, 255, 255), center, self.radius, 2)
             
             # Indicador de dirección más nítido
-            end_x = int(self.x + np.cos(self.angle) * (self.radius + 5))
-            end_y = int(self.y + np.sin(self.angle) * (self.radius + 5))
+            end_x = int(self.x + math.cos(self.angle) * (self.radius + 5))
+            end_y = int(self.y + math.sin(self.angle) * (self.radius + 5))
             pygame.draw.line(screen, (255, 255, 255), 
-                           (int(self.x), int(self.y)), (end_x, end_y), 3)
+                           center, (end_x, end_y), 3)
             
             # Punto central para mejor definición
-            pygame.draw.circle(screen, (0, 0, 0), (int(self.x), int(self.y)), 2)
+            pygame.draw.circle(screen, (0, 0, 0), center, 2)
         
         # Dibujar barra de vida
-        self._draw_health_bar(screen)
+        self._draw_health_bar(screen, cx, cy)
         
         # Dibujar color según fitness
-        self._draw_fitness_indicator(screen)
+        self._draw_fitness_indicator(screen, center)
         
         # Efecto de comer
         if hasattr(self, 'eating') and self.eating and particle_system:
             particle_system.add_food_effect(self.x, self.y)
     
-    def _draw_health_bar(self, screen):
+    def _draw_health_bar(self, screen, cx, cy):
         """Dibuja barra de vida del agente."""
         if not self.alive:
             return
         
         # Posición de la barra (arriba del agente)
-        bar_x = int(self.x - 15)
-        bar_y = int(self.y - 20)
+        bar_x = cx - 15
+        bar_y = cy - 20
         bar_width = 30
         bar_height = 4
         
@@ -927,29 +937,16 @@ class AdvancedAgent:
         # Borde de la barra
         pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 1)
     
-    def _draw_fitness_indicator(self, screen):
+    def _draw_fitness_indicator(self, screen, center):
         """Dibuja indicador de fitness como color de fondo."""
         if not self.alive:
             return
         
-        # Calcular color según fitness
-        fitness_percentage = self.fitness / 100.0
-        
-        if fitness_percentage < 0.25:
-            # Rojo (fitness bajo)
-            color = (255, 0, 0)
-        elif fitness_percentage < 0.5:
-            # Naranja (fitness medio-bajo)
-            color = (255, 165, 0)
-        elif fitness_percentage < 0.75:
-            # Amarillo (fitness medio)
-            color = (255, 255, 0)
-        else:
-            # Verde (fitness alto)
-            color = (0, 255, 0)
+        # Color según fitness: una consulta a la tabla (fitness truncado y acotado a 0-100)
+        color = self.FITNESS_COLOR_LUT[min(100, max(0, int(self.fitness)))]
         
         # Dibujar círculo de fitness (más grande que el agente)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.radius + 3, 2)
+        pygame.draw.circle(screen, color, center, self.radius + 3, 2)
     
     def _draw_death_effect(self, screen, tick):
         """Dibuja efecto de muerte simplificado."""
@@ -986,8 +983,8 @@ class SimpleNeuralNetwork:
         self.weights = []  # lista de matrices W
         self.biases = []   # lista de vectores b
         for layer_idx, (in_dim, out_dim) in enumerate(zip(layer_dims[:-1], layer_dims[1:])):
-            W = np.random.randn(in_dim, out_dim) * 0.5
-            b = np.random.randn(out_dim) * 0.1
+            W = _rng.standard_normal((in_dim, out_dim)) * 0.5
+            b = _rng.standard_normal(out_dim) * 0.1
             
             # Ajustar sesgos de la capa de salida para favorecer movimiento recto
             # Índices: 0=move_forward, 1=turn_left, 2=turn_right, 3=eat
@@ -1036,10 +1033,10 @@ class SimpleNeuralNetwork:
         for i in range(len(self.weights)):
             W = self.weights[i]
             b = self.biases[i]
-            mask_W = np.random.random(W.shape) < mutation_rate
-            W[mask_W] += np.random.randn(*W[mask_W].shape) * 0.1
-            mask_b = np.random.random(b.shape) < mutation_rate
-            b[mask_b] += np.random.randn(*b[mask_b].shape) * 0.1
+            mask_W = _rng.random(W.shape) < mutation_rate
+            W[mask_W] += _rng.standard_normal(np.count_nonzero(mask_W)) * 0.1
+            mask_b = _rng.random(b.shape) < mutation_rate
+            b[mask_b] += _rng.standard_normal(np.count_nonzero(mask_b)) * 0.1
         # Back-compat referencias
         self.W1 = self.weights[0]
         self.b1 = self.biases[0]
@@ -1055,11 +1052,11 @@ class SimpleNeuralNetwork:
             W_child = child.weights[i]
             b_child = child.biases[i]
             # Matrices
-            mask_W = np.random.random(W_self.shape) < 0.5
+            mask_W = _rng.random(W_self.shape) < 0.5
             W_child[mask_W] = W_self[mask_W]
             W_child[~mask_W] = W_other[~mask_W]
             # Sesgos
-            mask_b = np.random.random(b_self.shape) < 0.5
+            mask_b = _rng.random(b_self.shape) < 0.5
             b_child[mask_b] = b_self[mask_b]
             b_child[~mask_b] = b_other[~mask_b]
         # Back-compat referencias
@@ -23,8 +23,8 @@ class LearningMonitor:
         self.clustering_history = []
         self.behavior_patterns = []
         
-    def record_generation(self, generation, agents, world):
-        """Registra datos de una generación."""
+    def record_generation(self, generation, agents, world, diversity=None):
+        """Registra datos de una generación (diversity: valor ya calculado para no repetirlo)."""
         if not agents:
             return
             
@@ -46,7 +46,7 @@ class LearningMonitor:
             'avg_age': float(np.mean(ages)),
             'max_age': float(np.max(ages)),
             'avg_distance': float(np.mean(distances)),
-            'diversity': float(self._calculate_diversity(agents)),
+            'diversity': float(self._calculate_diversity(agents) if diversity is None else diversity),
             'alive_count': len([a for a in agents if a.alive])
         }
         
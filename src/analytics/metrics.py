@@ -21,7 +21,7 @@ class MetricType(Enum):
     EVOLUTION = "evolution"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetricData:
     """Datos de una métrica."""
     timestamp: float
@@ -48,24 +48,21 @@ class GeneticAlgorithm:
             valid_position = True
             if self.world:
                 # Verificar colisión con obstáculos
-                for obstacle in self.world.obstacles:
-                    if obstacle.collides_with(x, y, 35):  # Radio más grande para spawn
-                        valid_position = False
-                        break
+                if self.world.hits_obstacle(x, y, 35):  # Radio más grande para spawn
+                    valid_position = False
                 
                 # Verificar colisión con el estanque
                 if valid_position:
-                    for pond_obj in self.world.pond_obstacles:
-                        if pond_obj.collides_with(x, y, 35, 35):
-                            valid_position = False
-                            break
+                    if self.world.hits_pond(x, y, 35, 35):
+                        valid_position = False
                 
                 # Verificar colisión con comida
                 if valid_position:
                     for food in self.world.food_items:
                         if not food['eaten']:
-                            distance = ((x - food['x'])**2 + (y - food['y'])**2)**0.5
-                            if distance < 35:
+                            dx = x - food['x']
+                            dy = y - food['y']
+                            if dx * dx + dy * dy < 35 * 35:  # Comparar distancia² (sin raíz)
                                 valid_position = False
                                 break
                 
@@ -82,10 +79,8 @@ class GeneticAlgorithm:
                                 0 <= test_y < self.world.screen_height):
                                 # Verificar que no esté en obstáculo
                                 obstacle_free = True
-                                for obstacle in self.world.obstacles:
-                                    if obstacle.collides_with(test_x, test_y, 20):
-                                        obstacle_free = False
-                                        break
+                                if self.world.hits_obstacle(test_x, test_y, 20):
+                                    obstacle_free = False
                                 if obstacle_free:
                                     free_directions += 1
                     
@@ -143,17 +138,13 @@ class GeneticAlgorithm:
                         valid_position = True
                         
                         # Verificar colisión con obstáculos
-                        for obstacle in self.world.obstacles:
-                            if obstacle.collides_with(x, y, 35):
-                                valid_position = False
-                                break
+                        if self.world.hits_obstacle(x, y, 35):
+                            valid_position = False
                         
                         # Verificar colisión con el estanque
                         if valid_position:
-                            for pond_obj in self.world.pond_obstacles:
-                                if pond_obj.collides_with(x, y, 35, 35):
-                                    valid_position = False
-                                    break
+                            if self.world.hits_pond(x, y, 35, 35):
+                                valid_position = False
                         
                         attempts += 1
                     
@@ -165,10 +156,8 @@ class GeneticAlgorithm:
                             for test_y in [100, 200, 300, 400, 500, 600]:
                                 # Verificar que no esté en estanque
                                 safe_position = True
-                                for pond_obj in self.world.pond_obstacles:
-                                    if pond_obj.collides_with(test_x, test_y, 35, 35):
-                                        safe_position = False
-                                        break
+                                if self.world.hits_pond(test_x, test_y, 35, 35):
+                                    safe_position = False
                                 if safe_position:
                                     safe_x, safe_y = test_x, test_y
                                     break
@@ -196,15 +185,11 @@ class GeneticAlgorithm:
                         x = random.randint(50, 900)
                         y = random.randint(50, 750)
                         valid_position = True
-                        for obstacle in self.world.obstacles:
-                            if obstacle.collides_with(x, y, 35):
-                                valid_position = False
-                                break
+                        if self.world.hits_obstacle(x, y, 35):
+                            valid_position = False
                         if valid_position:
-                            for pond_obj in self.world.pond_obstacles:
-                                if pond_obj.collides_with(x, y, 35, 35):
-                                    valid_position = False
-                                    break
+                            if self.world.hits_pond(x, y, 35, 35):
+                                valid_position = False
                         attempts += 1
                     if not valid_position:
                         x = 100
@@ -229,17 +214,13 @@ class GeneticAlgorithm:
                         valid_position = True
                         
                         # Verificar colisión con obstáculos
-                        for obstacle in self.world.obstacles:
-                            if obstacle.collides_with(x, y, 35):
-                                valid_position = False
-                                break
+                        if self.world.hits_obstacle(x, y, 35):
+                            valid_position = False
                         
                         # Verificar colisión con el estanque
                         if valid_position:
-                            for pond_obj in self.world.pond_obstacles:
-                                if pond_obj.collides_with(x, y, 35, 35):
-                                    valid_position = False
-                                    break
+                            if self.world.hits_pond(x, y, 35, 35):
+                                valid_position = False
                         
                         attempts += 1
                     
@@ -251,10 +232,8 @@ class GeneticAlgorithm:
                             for test_y in [100, 200, 300, 400, 500, 600]:
                                 # Verificar que no esté en estanque
                                 safe_position = True
-                                for pond_obj in self.world.pond_obstacles:
-                                    if pond_obj.collides_with(test_x, test_y, 35, 35):
-                                        safe_position = False
-                                        break
+                                if self.world.hits_pond(test_x, test_y, 35, 35):
+                                    safe_position = False
                                 if safe_position:
                                     safe_x, safe_y = test_x, test_y
                                     break
@@ -315,17 +294,13 @@ class GeneticAlgorithm:
                 valid_position = True
                 
                 # Verificar colisión con obstáculos
-                for obstacle in self.world.obstacles:
-                    if obstacle.collides_with(x, y, 35):
-                        valid_position = False
-                        break
+                if self.world.hits_obstacle(x, y, 35):
+                    valid_position = False
                 
                 # Verificar colisión con el estanque
                 if valid_position:
-                    for pond_obj in self.world.pond_obstacles:
-                        if pond_obj.collides_with(x, y, 35, 35):
-                            valid_position = False
-                            break
+                    if self.world.hits_pond(x, y, 35, 35):
+                        valid_position = False
                 
                 attempts += 1
             
@@ -378,17 +353,13 @@ class GeneticAlgorithm:
             valid_position = True
             if self.world:
                 # Verificar colisión con obstáculos
-                for obstacle in self.world.obstacles:
-                    if obstacle.collides_with(x, y, 35):
-                        valid_position = False
-                        break
+                if self.world.hits_obstacle(x, y, 35):
+                    valid_position = False
                 
                 # Verificar colisión con el estanque
                 if valid_position:
-                    for pond_obj in self.world.pond_obstacles:
-                        if pond_obj.collides_with(x, y, 35, 35):
-                            valid_position = False
-                            break
+                    if self.world.hits_pond(x, y, 35, 35):
+                        valid_position = False
                 
                 attempts += 1
                 
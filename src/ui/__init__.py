@@ -6,9 +6,11 @@ Contiene sistemas de renderizado, estadísticas y popups.
 from .renderer import SpriteManager, ParticleSystem
 from .stats import StatsPanel
 from .popup import SummaryPopup
+from .fonts import get_font, get_freetype_font, render_text, render_freetype_text
 
 __all__ = [
     'SpriteManager', 'ParticleSystem',
     'StatsPanel',
-    'SummaryPopup'
+    'SummaryPopup',
+    'get_font', 'get_freetype_font', 'render_text', 'render_freetype_text'
 ]
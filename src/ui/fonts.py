@@ -0,0 +1,49 @@
+"""
+Cache compartido de fuentes.
+"""
+
+from functools import lru_cache
+
+import pygame
+import pygame.freetype
+
+# pygame.font reduce la fuente por defecto a este factor; se replica en FreeType
+# para que un mismo tamaño se vea igual con ambos motores.
+DEFAULT_FONT_SCALE = 0.6875
+
+
+@lru_cache(maxsize=16)
+def get_font(size, path=None):
+    """Obtiene una fuente compartida por (tamaño, ruta); se crea una sola vez."""
+    return pygame.font.Font(path, size)
+
+
+@lru_cache(maxsize=512)
+def render_text(text, size, color):
+    """Rasteriza texto con la fuente compartida de ese tamaño y cachea la superficie.
+
+    La superficie devuelta es compartida: solo debe usarse para blit, no modificarse.
+    """
+    return get_font(size).render(text, True, color)
+
+
+@lru_cache(maxsize=16)
+def get_freetype_font(size, path=None):
+    """Obtiene una fuente FreeType compartida (permite render_to directo sobre una superficie)."""
+    if not pygame.freetype.get_init():
+        pygame.freetype.init()
+    if path is None:
+        size = size * DEFAULT_FONT_SCALE
+    return pygame.freetype.Font(path, size)
+
+
+@lru_cache(maxsize=256)
+def render_freetype_text(text, size, color):
+    """Rasteriza texto con la fuente FreeType compartida de ese tamaño y cachea la superficie.
+
+    La superficie devuelta es compartida: solo debe usarse para blit, no modificarse.
+    """
+    surface = get_freetype_font(size).render(text, color)[0]
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()  # Formato de pantalla: los blits pasan a ser copias directas
+    return surface
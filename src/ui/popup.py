@@ -3,11 +3,27 @@ Popup de resumen de generación.
 """
 
 import pygame
+import numpy as np
+from itertools import islice
+
+from .fonts import render_text
 
 
 class SummaryPopup:
     """Cuadro de resumen de generación."""
     
+    # Fuentes más pequeñas (los textos se rasterizan una vez y se cachean en render_text)
+    FONT_SIZE = 16
+    TITLE_FONT_SIZE = 22
+    BIG_FONT_SIZE = 18
+    
+    # Colores constantes (una sola tupla compartida por todos los draws)
+    ACCENT_COLOR = (100, 255, 150)
+    TEXT_COLOR = (200, 200, 200)
+    DIM_COLOR = (150, 150, 150)
+    GRID_MAJOR_COLOR = (60, 60, 80)
+    GRID_MINOR_COLOR = (50, 50, 70)
+    
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -19,61 +35,74 @@ class SummaryPopup:
         self.visible = False
         self.generation_data = None
         self.fitness_history = []
-        
-        # Fuentes más pequeñas
-        self.font = pygame.font.Font(None, 16)  # Más pequeña
-        self.title_font = pygame.font.Font(None, 22)  # Más pequeña
-        self.big_font = pygame.font.Font(None, 18)  # Más pequeña
+        self._history_len = 0  # Generaciones del historial visibles en este show()
+        self._popup_surface = None  # Popup pre-renderizado (se reconstruye en cada show)
     
     def show(self, generation_data, fitness_history):
         """Muestra el cuadro de resumen."""
         self.visible = True
         self.generation_data = generation_data
-        self.fitness_history = fitness_history.copy()
+        # El historial solo crece: basta una referencia y su largo actual (sin copiarlo)
+        self.fitness_history = fitness_history
+        self._history_len = len(fitness_history)
+        self._popup_surface = None
     
     def hide(self):
         """Oculta el cuadro de resumen."""
         self.visible = False
         self.generation_data = None
+        self._popup_surface = None
     
     def handle_click(self, pos):
         """Maneja clicks en el cuadro."""
         if not self.visible:
             return False
+        
+        # Descartar primero los clicks fuera del cuadro (el caso más común)
+        px, py = pos
+        if not (self.x <= px <= self.x + self.width and
+                self.y <= py <= self.y + self.height):
+            return False
             
-        # Verificar click en botón cerrar (coordenadas fijas)
+        # Verificar click en botón cerrar (coordenadas fijas, dentro del cuadro)
         close_button_x = self.x + self.width - 120
         close_button_y = self.y + self.height - 50
         close_button_width = 100
         close_button_height = 30
         
-        if (close_button_x <= pos[0] <= close_button_x + close_button_width and 
-            close_button_y <= pos[1] <= close_button_y + close_button_height):
+        if (close_button_x <= px <= close_button_x + close_button_width and 
+            close_button_y <= py <= close_button_y + close_button_height):
             self.hide()
-            return True
-            
-        # Verificar click en el cuadro (NO cerrar automáticamente)
-        if (self.x <= pos[0] <= self.x + self.width and 
-            self.y <= pos[1] <= self.y + self.height):
-            return True  # Click detectado pero no cierra
-            
-        return False
+        
+        # Click detectado dentro del cuadro (solo el botón lo cierra)
+        return True
     
     def draw(self, screen):
         """Dibuja el cuadro de resumen."""
         if not self.visible or not self.generation_data:
             return
         
+        # El contenido solo cambia en show(): se rasteriza en el primer draw y luego solo se copia
+        if self._popup_surface is None:
+            self._popup_surface = self._render_popup()
+        
+        screen.blit(self._popup_surface, (self.x, self.y))
+    
+    def _render_popup(self):
+        """Rasteriza el cuadro de resumen completo en una superficie propia."""
         # Crear superficie semi-transparente
         popup_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         popup_surface.fill((0, 0, 0, 200))  # Fondo semi-transparente
         
+        # Los textos se acumulan y se copian juntos con un único blits()
+        blits = []
+        
         # Título
-        title = self.title_font.render(f"GENERACIÓN {self.generation_data.get('generation', 0)} COMPLETADA", True, (100, 255, 150))
-        popup_surface.blit(title, (20, 20))
+        title = render_text(f"GENERACIÓN {self.generation_data.get('generation', 0)} COMPLETADA", self.TITLE_FONT_SIZE, self.ACCENT_COLOR)
+        blits.append((title, (20, 20)))
         
         # Línea separadora
-        pygame.draw.line(popup_surface, (100, 255, 150), (20, 50), (self.width - 20, 50), 2)
+        pygame.draw.line(popup_surface, self.ACCENT_COLOR, (20, 50), (self.width - 20, 50), 2)
         
         # Contenido más compacto - 2 columnas
         y_offset = 70
@@ -83,8 +112,8 @@ class SummaryPopup:
         right_x = self.width // 2 + 20
         
         # FITNESS
-        fitness_title = self.big_font.render("FITNESS", True, (100, 255, 150))
-        popup_surface.blit(fitness_title, (left_x, y_offset))
+        fitness_title = render_text("FITNESS", self.BIG_FONT_SIZE, self.ACCENT_COLOR)
+        blits.append((fitness_title, (left_x, y_offset)))
         y_offset += 25
         
         fitness_stats = [
@@ -94,13 +123,13 @@ class SummaryPopup:
         ]
         
         for stat in fitness_stats:
-            text = self.font.render(stat, True, (200, 200, 200))
-            popup_surface.blit(text, (left_x + 10, y_offset))
+            text = render_text(stat, self.FONT_SIZE, self.TEXT_COLOR)
+            blits.append((text, (left_x + 10, y_offset)))
             y_offset += 18
         
         # COMPORTAMIENTO
-        behavior_title = self.big_font.render("COMPORTAMIENTO", True, (100, 255, 150))
-        popup_surface.blit(behavior_title, (left_x, y_offset + 10))
+        behavior_title = render_text("COMPORTAMIENTO", self.BIG_FONT_SIZE, self.ACCENT_COLOR)
+        blits.append((behavior_title, (left_x, y_offset + 10)))
         y_offset += 35
         
         # Convertir tiempo a minutos
@@ -113,16 +142,16 @@ class SummaryPopup:
         ]
         
         for stat in behavior_stats:
-            text = self.font.render(stat, True, (200, 200, 200))
-            popup_surface.blit(text, (left_x + 10, y_offset))
+            text = render_text(stat, self.FONT_SIZE, self.TEXT_COLOR)
+            blits.append((text, (left_x + 10, y_offset)))
             y_offset += 18
         
         # Columna derecha
         y_offset = 70
         
         # PROGRESO DEL PUZZLE
-        puzzle_title = self.big_font.render("PROGRESO PUZZLE", True, (100, 255, 150))
-        popup_surface.blit(puzzle_title, (right_x, y_offset))
+        puzzle_title = render_text("PROGRESO PUZZLE", self.BIG_FONT_SIZE, self.ACCENT_COLOR)
+        blits.append((puzzle_title, (right_x, y_offset)))
         y_offset += 25
         
         # Obtener datos del puzzle del mundo (si están disponibles)
@@ -134,8 +163,8 @@ class SummaryPopup:
         ]
         
         for stat in puzzle_stats:
-            text = self.font.render(stat, True, (200, 200, 200))
-            popup_surface.blit(text, (right_x + 10, y_offset))
+            text = render_text(stat, self.FONT_SIZE, self.TEXT_COLOR)
+            blits.append((text, (right_x + 10, y_offset)))
             y_offset += 18
         
         # CLUSTERING (si está disponible)
@@ -145,8 +174,8 @@ class SummaryPopup:
             clusterer = BehaviorClusterer(n_clusters=3)
             interpretations = clusterer.get_cluster_interpretation(cluster_stats)
             
-            clustering_title = self.big_font.render("CLUSTERING", True, (100, 255, 150))
-            popup_surface.blit(clustering_title, (right_x, y_offset + 10))
+            clustering_title = render_text("CLUSTERING", self.BIG_FONT_SIZE, self.ACCENT_COLOR)
+            blits.append((clustering_title, (right_x, y_offset + 10)))
             y_offset += 35
             
             # Ordenar clusters por tipo
@@ -162,16 +191,16 @@ class SummaryPopup:
             
             for strategy, count, fitness in sorted_clusters[:3]:
                 cluster_text = f"{strategy}: {count} ({fitness:.1f})"
-                text = self.font.render(cluster_text, True, (200, 200, 200))
-                popup_surface.blit(text, (right_x + 10, y_offset))
+                text = render_text(cluster_text, self.FONT_SIZE, self.TEXT_COLOR)
+                blits.append((text, (right_x + 10, y_offset)))
                 y_offset += 18
             
             if len(sorted_clusters) < 3:
                 y_offset += 18
         
         # ESTADÍSTICAS ADICIONALES
-        extra_title = self.big_font.render("ESTADÍSTICAS", True, (100, 255, 150))
-        popup_surface.blit(extra_title, (right_x, y_offset + 10))
+        extra_title = render_text("ESTADÍSTICAS", self.BIG_FONT_SIZE, self.ACCENT_COLOR)
+        blits.append((extra_title, (right_x, y_offset + 10)))
         y_offset += 35
         
         extra_stats = [
@@ -181,10 +210,12 @@ class SummaryPopup:
         ]
         
         for stat in extra_stats:
-            text = self.font.render(stat, True, (200, 200, 200))
-            popup_surface.blit(text, (right_x + 10, y_offset))
+            text = render_text(stat, self.FONT_SIZE, self.TEXT_COLOR)
+            blits.append((text, (right_x + 10, y_offset)))
             y_offset += 18
         
+        popup_surface.blits(blits, False)
+        
         # Gráfico de evolución (más alto y menos ancho)
         self._draw_fitness_graph(popup_surface, 280)  # Posición ajustada para el gráfico más alto
         
@@ -193,16 +224,15 @@ class SummaryPopup:
         pygame.draw.rect(popup_surface, (200, 50, 50), close_button)
         pygame.draw.rect(popup_surface, (255, 255, 255), close_button, 2)
         
-        close_text = self.font.render("CERRAR", True, (255, 255, 255))
+        close_text = render_text("CERRAR", self.FONT_SIZE, (255, 255, 255))
         text_rect = close_text.get_rect(center=close_button.center)
         popup_surface.blit(close_text, text_rect)
         
-        # Dibujar en pantalla
-        screen.blit(popup_surface, (self.x, self.y))
+        return popup_surface
     
     def _draw_fitness_graph(self, surface, y_start):
         """Dibuja un gráfico con escalas del fitness por generación."""
-        if len(self.fitness_history) < 2:
+        if self._history_len < 2:
             return
             
         graph_width = self.width - 120  # Más corto (menos ancho)
@@ -212,44 +242,58 @@ class SummaryPopup:
         
         # Fondo del gráfico
         pygame.draw.rect(surface, (40, 40, 60), (graph_x, graph_y, graph_width, graph_height))
-        pygame.draw.rect(surface, (100, 100, 100), (graph_x, graph_y, graph_width, graph_height), 1)
         
         # Escala fija del 0 al 100 para fitness
         min_fitness = 0
         max_fitness = 100
         
-        # Dibujar líneas de cuadrícula
-        for i in range(0, 101, 20):  # Líneas cada 20 puntos
+        # Dibujar líneas de cuadrícula cada 20 puntos (más marcadas cada 40): una polilínea
+        # en zigzag por color, cuyos tramos verticales quedan bajo el borde del gráfico
+        grid_right = graph_x + graph_width - 1
+        major_points = []
+        minor_points = []
+        for i in range(0, 101, 20):
             y = graph_y + graph_height - int((i / 100) * graph_height)
-            color = (60, 60, 80) if i % 40 == 0 else (50, 50, 70)  # Líneas más marcadas cada 40
-            pygame.draw.line(surface, color, (graph_x, y), (graph_x + graph_width, y), 1)
+            points = major_points if i % 40 == 0 else minor_points
+            if len(points) % 4 == 0:
+                points += [(graph_x, y), (grid_right, y)]
+            else:
+                points += [(grid_right, y), (graph_x, y)]
+        pygame.draw.lines(surface, self.GRID_MAJOR_COLOR, False, major_points, 1)
+        pygame.draw.lines(surface, self.GRID_MINOR_COLOR, False, minor_points, 1)
+        
+        # Borde del gráfico (después de la cuadrícula para tapar los tramos verticales)
+        pygame.draw.rect(surface, (100, 100, 100), (graph_x, graph_y, graph_width, graph_height), 1)
         
-        # Dibujar línea de datos
-        points = []
-        for i, fitness in enumerate(self.fitness_history):
-            x = graph_x + (i * graph_width) // (len(self.fitness_history) - 1)
-            y = graph_y + graph_height - int((fitness / 100) * graph_height)
-            points.append((x, y))
+        # Dibujar línea de datos (coordenadas de todos los puntos en una sola operación vectorizada)
+        n_points = self._history_len
+        xs = graph_x + (np.arange(n_points) * graph_width) // (n_points - 1)
+        fitness_values = np.fromiter(islice(self.fitness_history, n_points), dtype=np.float64, count=n_points)
+        ys = graph_y + graph_height - (fitness_values / 100 * graph_height).astype(np.int32)
+        points = np.column_stack((xs, ys)).tolist()
         
         if len(points) > 1:
-            pygame.draw.lines(surface, (100, 255, 150), False, points, 3)
+            pygame.draw.lines(surface, self.ACCENT_COLOR, False, points, 3)
             
         # Dibujar puntos en cada generación
+        labels = []
         for i, (x, y) in enumerate(points):
-            pygame.draw.circle(surface, (100, 255, 150), (x, y), 3)
+            pygame.draw.circle(surface, self.ACCENT_COLOR, (x, y), 3)
             # Etiqueta de generación
-            gen_text = self.font.render(f"G{i+1}", True, (150, 150, 150))
-            surface.blit(gen_text, (x - 10, graph_y + graph_height + 5))
+            gen_text = render_text(f"G{i+1}", self.FONT_SIZE, self.DIM_COLOR)
+            labels.append((gen_text, (x - 10, graph_y + graph_height + 5)))
         
         # Etiquetas del eje Y (fitness) - más espacio
         for i in range(0, 101, 20):
             y = graph_y + graph_height - int((i / 100) * graph_height)
-            fitness_text = self.font.render(f"{i}", True, (150, 150, 150))
-            surface.blit(fitness_text, (graph_x - 35, y - 8))  # Más espacio a la izquierda
+            fitness_text = render_text(f"{i}", self.FONT_SIZE, self.DIM_COLOR)
+            labels.append((fitness_text, (graph_x - 35, y - 8)))  # Más espacio a la izquierda
         
         # Título de los ejes
-        y_label = self.font.render("FITNESS", True, (100, 255, 150))
-        surface.blit(y_label, (10, graph_y + graph_height//2 - 20))  # Más espacio
+        y_label = render_text("FITNESS", self.FONT_SIZE, self.ACCENT_COLOR)
+        labels.append((y_label, (10, graph_y + graph_height//2 - 20)))  # Más espacio
+        
+        x_label = render_text("GENERACIONES", self.FONT_SIZE, self.ACCENT_COLOR)
+        labels.append((x_label, (graph_x + graph_width//2 - 50, graph_y + graph_height + 15)))  # Más cerca
         
-        x_label = self.font.render("GENERACIONES", True, (100, 255, 150))
-        surface.blit(x_label, (graph_x + graph_width//2 - 50, graph_y + graph_height + 15))  # Más cerca
+        surface.blits(labels, False)
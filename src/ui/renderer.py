@@ -4,18 +4,81 @@ Sistema de renderizado con sprites y partículas.
 
 import pygame
 import os
-import random
 import numpy as np
+from functools import lru_cache
+from math import floor, pi
+
+try:
+    from numba import njit
+except ImportError:  # Numba es opcional: sin él las partículas usan la ruta vectorizada de NumPy
+    njit = None
+
+# Centinela de cache: distingue "no pedido aún" de "sprite inexistente" (guardado como None)
+_MISSING = object()
+
+# Constantes angulares precalculadas (evitan np.pi y la aritmética en cada llamada)
+_QUARTERS_PER_RADIAN = 2 / pi
+
+
+@lru_cache(maxsize=128)
+def _load_raw(path):
+    """Lee un PNG de disco sin escalar; se conserva entre recargas para que cambiar la escala no vuelva a leer archivos."""
+    return pygame.image.load(path)
 
 
 class SpriteManager:
     """Gestor de sprites del juego."""
     
+    # Atributos fijos: acceso por descriptor de slot en los caminos calientes (sin __dict__ por instancia)
+    __slots__ = ('sprites', 'sprite_paths', 'scaled_sprites_cache', 'scaled_environment_cache',
+                 '_environment_lookup', '_atlas_pages', 'missing_sprite', '_agent_lut',
+                 '_water_frame_key', '_water_frame')
+    
+    # Direcciones del agente por cuadrante de ángulo (0 = derecha, 1 = abajo, 2 = izquierda, 3 = arriba)
+    AGENT_DIRECTIONS = ('right', 'down', 'left', 'up')
+    
+    # Clave del sprite por tipo de entorno ({} = variante); reemplaza la cadena de if/elif
+    ENVIRONMENT_SPRITE_KEYS = {
+        'grass': 'grass_{}',
+        'dirt': 'dirt_{}',
+        'wall': 'wall',
+        'tree': 'tree',
+        'stump': 'stump',
+        'water': 'water_{}',
+        'hut': 'hut',
+        'potion': 'potion',
+        'apple': 'apple',
+        'axe': 'axe',
+        'grave': 'grave',
+        'door': 'door',
+        'door_iron': 'door_iron',
+        'chest': 'chest',
+        'chest_opened': 'chest_opened',
+        'gold_key': 'gold_key',
+        'red_key': 'red_key',
+        'perimeter': 'perimeter_{}',
+        'pond': 'pond_{}',
+    }
+    
+    # Tamaño de cada página del atlas de texturas (sobra para ~45 sprites de 16-32 px)
+    ATLAS_SIZE = (1024, 1024)
+    
     def __init__(self):
-        self.sprites = {}
-        self.sprite_paths = {}  # Almacenar rutas para recarga
-        self.scaled_sprites_cache = {}  # Cache de sprites escalados (clave: sprite_key_size)
+        self.sprites = {}  # Sprites ya cargados (se llenan bajo demanda en _get_sprite)
+        self.sprite_paths = {}  # Ruta de cada sprite (también usada para recargar)
+        self.scaled_sprites_cache = {}  # Cache de sprites escalados (clave: (dirección, frame, tamaño))
+        self.scaled_environment_cache = {}  # Sprites de entorno ya escalados (clave: (tipo, variante, tamaño))
+        self._environment_lookup = {}  # (tipo, variante) -> sprite, resuelto en el primer pedido
+        # Atlas: una página por formato de píxel (opaco / con alfa) -> [superficie, cursor_x, cursor_y, alto_fila]
+        self._atlas_pages = {}
+        # Sprite "faltante" compartido (magenta) para los sitios que dibujan sin fallback propio
+        self.missing_sprite = pygame.Surface((16, 16))
+        self.missing_sprite.fill((255, 0, 255))
+        # Frame de agua del tick actual: (tick // 10, tamaño) -> sprite, compartido por todos los tiles
+        self._water_frame_key = None
+        self._water_frame = None
         self._load_sprites()
+        self._build_agent_lut()
 
     def _make_white_transparent(self, surface, tolerance=40):
         """Convierte en transparente los píxeles casi blancos (para eliminar halos).
@@ -36,70 +99,108 @@ class SpriteManager:
         return surface
     
     def _load_sprites(self):
-        """Carga todos los sprites del juego."""
+        """Registra las rutas de todos los sprites del juego (se cargan en su primer uso)."""
         sprite_dir = "assets/sprites"
         
         # Sprites de agentes (animados)
-        self.sprites['agent_down_1'] = self._load_sprite(f"{sprite_dir}/characters/down_1.png")
-        self.sprites['agent_down_2'] = self._load_sprite(f"{sprite_dir}/characters/down_2.png")
-        self.sprites['agent_up_1'] = self._load_sprite(f"{sprite_dir}/characters/up_1.png")
-        self.sprites['agent_up_2'] = self._load_sprite(f"{sprite_dir}/characters/up_2.png")
-        self.sprites['agent_left_1'] = self._load_sprite(f"{sprite_dir}/characters/left_1.png")
-        self.sprites['agent_left_2'] = self._load_sprite(f"{sprite_dir}/characters/left_2.png")
-        self.sprites['agent_right_1'] = self._load_sprite(f"{sprite_dir}/characters/right_1.png")
-        self.sprites['agent_right_2'] = self._load_sprite(f"{sprite_dir}/characters/right_2.png")
-        self.sprites['agent'] = self._load_sprite(f"{sprite_dir}/characters/player.png")
+        self.sprite_paths['agent_down_1'] = f"{sprite_dir}/characters/down_1.png"
+        self.sprite_paths['agent_down_2'] = f"{sprite_dir}/characters/down_2.png"
+        self.sprite_paths['agent_up_1'] = f"{sprite_dir}/characters/up_1.png"
+        self.sprite_paths['agent_up_2'] = f"{sprite_dir}/characters/up_2.png"
+        self.sprite_paths['agent_left_1'] = f"{sprite_dir}/characters/left_1.png"
+        self.sprite_paths['agent_left_2'] = f"{sprite_dir}/characters/left_2.png"
+        self.sprite_paths['agent_right_1'] = f"{sprite_dir}/characters/right_1.png"
+        self.sprite_paths['agent_right_2'] = f"{sprite_dir}/characters/right_2.png"
+        self.sprite_paths['agent'] = f"{sprite_dir}/characters/player.png"
         
         # Sprites de entorno
-        self.sprites['grass_1'] = self._load_sprite(f"{sprite_dir}/environment/001.png")
-        self.sprites['grass_2'] = self._load_sprite(f"{sprite_dir}/environment/002.png")
-        self.sprites['dirt_1'] = self._load_sprite(f"{sprite_dir}/environment/003.png")
-        self.sprites['dirt_2'] = self._load_sprite(f"{sprite_dir}/environment/017.png")
-        self.sprites['wall'] = self._load_sprite(f"{sprite_dir}/environment/032.png")
-        self.sprites['tree'] = self._load_sprite(f"{sprite_dir}/environment/016.png")
-        self.sprites['stump'] = self._load_sprite(f"{sprite_dir}/environment/036.png")
-        self.sprites['water_1'] = self._load_sprite(f"{sprite_dir}/environment/018.png")
-        self.sprites['water_2'] = self._load_sprite(f"{sprite_dir}/environment/019.png")
-        self.sprites['hut'] = self._load_sprite(f"{sprite_dir}/environment/033.png")
-        self.sprites['potion'] = self._load_sprite(f"{sprite_dir}/environment/035.png")
-        self.sprites['apple'] = self._load_sprite(f"{sprite_dir}/environment/034.png")
-        self.sprites['axe'] = self._load_sprite(f"{sprite_dir}/environment/axe.png")
-        self.sprites['grave'] = self._load_sprite(f"{sprite_dir}/environment/grave.png")
+        self.sprite_paths['grass_1'] = f"{sprite_dir}/environment/001.png"
+        self.sprite_paths['grass_2'] = f"{sprite_dir}/environment/002.png"
+        self.sprite_paths['dirt_1'] = f"{sprite_dir}/environment/003.png"
+        self.sprite_paths['dirt_2'] = f"{sprite_dir}/environment/017.png"
+        self.sprite_paths['wall'] = f"{sprite_dir}/environment/032.png"
+        self.sprite_paths['tree'] = f"{sprite_dir}/environment/016.png"
+        self.sprite_paths['stump'] = f"{sprite_dir}/environment/036.png"
+        self.sprite_paths['water_1'] = f"{sprite_dir}/environment/018.png"
+        self.sprite_paths['water_2'] = f"{sprite_dir}/environment/019.png"
+        self.sprite_paths['hut'] = f"{sprite_dir}/environment/033.png"
+        self.sprite_paths['potion'] = f"{sprite_dir}/environment/035.png"
+        self.sprite_paths['apple'] = f"{sprite_dir}/environment/034.png"
+        self.sprite_paths['axe'] = f"{sprite_dir}/environment/axe.png"
+        self.sprite_paths['grave'] = f"{sprite_dir}/environment/grave.png"
         
         # Sprites de fortalezas
-        self.sprites['door'] = self._load_sprite(f"{sprite_dir}/environment/door.png")
-        self.sprites['door_iron'] = self._load_sprite(f"{sprite_dir}/environment/door_iron.png")
-        self.sprites['chest'] = self._load_sprite(f"{sprite_dir}/environment/chest.png")
-        self.sprites['chest_opened'] = self._load_sprite(f"{sprite_dir}/environment/chest_opened.png")
-        self.sprites['gold_key'] = self._load_sprite(f"{sprite_dir}/environment/gold_key.png")
-        self.sprites['red_key'] = self._load_sprite(f"{sprite_dir}/environment/red_key.png")
+        self.sprite_paths['door'] = f"{sprite_dir}/environment/door.png"
+        self.sprite_paths['door_iron'] = f"{sprite_dir}/environment/door_iron.png"
+        self.sprite_paths['chest'] = f"{sprite_dir}/environment/chest.png"
+        self.sprite_paths['chest_opened'] = f"{sprite_dir}/environment/chest_opened.png"
+        self.sprite_paths['gold_key'] = f"{sprite_dir}/environment/gold_key.png"
+        self.sprite_paths['red_key'] = f"{sprite_dir}/environment/red_key.png"
         
         # Sprites del perímetro decorativo
-        self.sprites['perimeter_021'] = self._load_sprite(f"{sprite_dir}/environment/021.png")  # Lado inferior
-        self.sprites['perimeter_023'] = self._load_sprite(f"{sprite_dir}/environment/023.png")  # Lado derecho
-        self.sprites['perimeter_024'] = self._load_sprite(f"{sprite_dir}/environment/024.png")  # Lado izquierdo
-        self.sprites['perimeter_026'] = self._load_sprite(f"{sprite_dir}/environment/026.png")  # Lado superior
-        self.sprites['perimeter_028'] = self._load_sprite(f"{sprite_dir}/environment/028.png")  # Esquina superior izquierda
-        self.sprites['perimeter_029'] = self._load_sprite(f"{sprite_dir}/environment/029.png")  # Esquina superior derecha
-        self.sprites['perimeter_030'] = self._load_sprite(f"{sprite_dir}/environment/030.png")  # Esquina inferior izquierda
-        self.sprites['perimeter_031'] = self._load_sprite(f"{sprite_dir}/environment/031.png")  # Esquina inferior derecha
+        self.sprite_paths['perimeter_021'] = f"{sprite_dir}/environment/021.png"  # Lado inferior
+        self.sprite_paths['perimeter_023'] = f"{sprite_dir}/environment/023.png"  # Lado derecho
+        self.sprite_paths['perimeter_024'] = f"{sprite_dir}/environment/024.png"  # Lado izquierdo
+        self.sprite_paths['perimeter_026'] = f"{sprite_dir}/environment/026.png"  # Lado superior
+        self.sprite_paths['perimeter_028'] = f"{sprite_dir}/environment/028.png"  # Esquina superior izquierda
+        self.sprite_paths['perimeter_029'] = f"{sprite_dir}/environment/029.png"  # Esquina superior derecha
+        self.sprite_paths['perimeter_030'] = f"{sprite_dir}/environment/030.png"  # Esquina inferior izquierda
+        self.sprite_paths['perimeter_031'] = f"{sprite_dir}/environment/031.png"  # Esquina inferior derecha
         
         # Sprites del estanque móvil (3x3)
-        self.sprites['pond_020'] = self._load_sprite(f"{sprite_dir}/environment/020.png")  # Esquina superior izquierda
-        self.sprites['pond_021'] = self._load_sprite(f"{sprite_dir}/environment/021.png")  # Lado superior
-        self.sprites['pond_022'] = self._load_sprite(f"{sprite_dir}/environment/022.png")  # Esquina superior derecha
-        self.sprites['pond_023'] = self._load_sprite(f"{sprite_dir}/environment/023.png")  # Lado izquierdo
-        self.sprites['pond_019'] = self._load_sprite(f"{sprite_dir}/environment/019.png")  # Agua central
-        self.sprites['pond_024'] = self._load_sprite(f"{sprite_dir}/environment/024.png")  # Lado derecho
-        self.sprites['pond_025'] = self._load_sprite(f"{sprite_dir}/environment/025.png")  # Esquina inferior izquierda
-        self.sprites['pond_026'] = self._load_sprite(f"{sprite_dir}/environment/026.png")  # Lado inferior
-        self.sprites['pond_027'] = self._load_sprite(f"{sprite_dir}/environment/027.png")  # Esquina inferior derecha
+        self.sprite_paths['pond_020'] = f"{sprite_dir}/environment/020.png"  # Esquina superior izquierda
+        self.sprite_paths['pond_021'] = f"{sprite_dir}/environment/021.png"  # Lado superior
+        self.sprite_paths['pond_022'] = f"{sprite_dir}/environment/022.png"  # Esquina superior derecha
+        self.sprite_paths['pond_023'] = f"{sprite_dir}/environment/023.png"  # Lado izquierdo
+        self.sprite_paths['pond_019'] = f"{sprite_dir}/environment/019.png"  # Agua central
+        self.sprite_paths['pond_024'] = f"{sprite_dir}/environment/024.png"  # Lado derecho
+        self.sprite_paths['pond_025'] = f"{sprite_dir}/environment/025.png"  # Esquina inferior izquierda
+        self.sprite_paths['pond_026'] = f"{sprite_dir}/environment/026.png"  # Lado inferior
+        self.sprite_paths['pond_027'] = f"{sprite_dir}/environment/027.png"  # Esquina inferior derecha
+    
+    def _get_sprite(self, sprite_key):
+        """Obtiene un sprite, cargándolo desde disco la primera vez que se pide."""
+        try:
+            return self.sprites[sprite_key]
+        except KeyError:
+            path = self.sprite_paths.get(sprite_key)
+            # Se guarda también None para no reintentar (ni re-avisar) un archivo faltante en cada frame
+            sprite = self._load_sprite(path) if path else None
+            if sprite is not None:
+                sprite = self._pack_into_atlas(sprite)
+            self.sprites[sprite_key] = sprite
+            return sprite
+    
+    def _pack_into_atlas(self, sprite):
+        """Copia el sprite a la página del atlas de su formato y devuelve la subsuperficie que lo referencia.
+        Empaquetado por estantes (filas de izquierda a derecha); si la página está llena devuelve el sprite suelto.
+        """
+        has_alpha = bool(sprite.get_flags() & pygame.SRCALPHA)
+        page = self._atlas_pages.get(has_alpha)
+        if page is None:
+            # Misma profundidad y formato que el sprite (ya convertido a formato de pantalla)
+            atlas = pygame.Surface(self.ATLAS_SIZE, pygame.SRCALPHA if has_alpha else 0, sprite)
+            page = self._atlas_pages[has_alpha] = [atlas, 0, 0, 0]
+        atlas, cursor_x, cursor_y, row_height = page
+        
+        width, height = sprite.get_size()
+        atlas_width, atlas_height = self.ATLAS_SIZE
+        if cursor_x + width > atlas_width:
+            cursor_x, cursor_y, row_height = 0, cursor_y + row_height, 0
+        if width > atlas_width or cursor_y + height > atlas_height:
+            return sprite  # No entra en la página: se queda como superficie independiente
+        
+        # Con alfa se copia con MAX sobre la página transparente para no mezclar contra el fondo
+        atlas.blit(sprite, (cursor_x, cursor_y), special_flags=pygame.BLEND_RGBA_MAX if has_alpha else 0)
+        region = atlas.subsurface((cursor_x, cursor_y, width, height))
+        page[1:] = [cursor_x + width, cursor_y, max(row_height, height)]
+        return region
     
-    def _load_sprite(self, path, sprite_key=None):
+    def _load_sprite(self, path):
         """Carga un sprite desde archivo."""
         try:
             if os.path.exists(path):
-                sprite = pygame.image.load(path).convert_alpha()
+                sprite = _load_raw(path)
                 # Escalar sprite según el factor de escalado actual
                 from config import SimulationConfig
                 scale_factor = SimulationConfig.SPRITE_SCALE_FACTOR
@@ -112,11 +213,8 @@ class SpriteManager:
                 if 'grave' in path.lower():
                     sprite = self._make_white_transparent(sprite, tolerance=60)
                 
-                # Almacenar ruta para recarga
-                if sprite_key:
-                    self.sprite_paths[sprite_key] = path
-                
-                return sprite
+                # Convertir una sola vez al formato de la pantalla (los blits pasan a ser copias directas)
+                return self._to_display_format(sprite)
             else:
                 print(f"⚠️ Sprite no encontrado: {path}")
                 return None
@@ -124,61 +222,73 @@ class SpriteManager:
             #print(f"❌ Error cargando sprite {path}: {e}")
             return None
     
+    def _to_display_format(self, sprite):
+        """Convierte el sprite al formato de la pantalla: opaco con convert(), con transparencia con convert_alpha()."""
+        if pygame.display.get_surface() is None:
+            return sprite  # Sin ventana (modo headless) no hay formato de pantalla al que convertir
+        width, height = sprite.get_size()
+        if pygame.mask.from_surface(sprite, 254).count() == width * height:
+            return sprite.convert()
+        return sprite.convert_alpha()
+    
     def reload_sprites(self):
         """Recarga todos los sprites con el nuevo factor de escalado."""
+        from config import SimulationConfig
         print(f"🔄 Recargando sprites con factor {SimulationConfig.SPRITE_SCALE_FACTOR:.2f}x")
-        for sprite_key, path in self.sprite_paths.items():
-            self.sprites[sprite_key] = self._load_sprite(path, sprite_key)
+        # Vaciar los cargados: cada sprite se re-escala desde su imagen original (en caché) en su próximo uso
+        self.sprites.clear()
+        self._environment_lookup.clear()
+        self._atlas_pages.clear()
+        self.scaled_sprites_cache.clear()
+        self.scaled_environment_cache.clear()
+        self._water_frame_key = None
+        self._build_agent_lut()
     
-    def get_agent_sprite(self, angle=0, tick=0, moving=False):
-        """Obtiene sprite del agente según dirección y animación."""
-        # Normalizar ángulo a 0-2π
-        angle = angle % (2 * np.pi)
-        
-        # Determinar dirección basada en ángulo (más preciso)
-        if -np.pi/4 <= angle <= np.pi/4:
-            direction = 'right'
-        elif np.pi/4 < angle <= 3*np.pi/4:
-            direction = 'down'
-        elif 3*np.pi/4 < angle <= 5*np.pi/4:
-            direction = 'left'
-        else:
-            direction = 'up'
-        
-        # Animación solo si está moviéndose
-        if moving:
-            frame = 1 if (tick // 8) % 2 == 0 else 2  # Animación más rápida
-        else:
-            frame = 1  # Frame estático cuando no se mueve
-        
-        sprite_key = f'agent_{direction}_{frame}'
-        sprite = self.sprites.get(sprite_key)
+    def _build_agent_lut(self):
+        """Precalcula la tabla [dirección][frame] -> sprite del agente (con fallback al sprite base)."""
+        fallback = self._get_sprite('agent')
+        lut = []
+        for direction in self.AGENT_DIRECTIONS:
+            frames = []
+            for frame in (1, 2):
+                sprite = self._get_sprite(f'agent_{direction}_{frame}')
+                frames.append(sprite if sprite is not None else fallback)
+            lut.append(tuple(frames))
+        self._agent_lut = tuple(lut)  # 4x2 inmutable: se indexa directo, sin claves ni f-strings
+    
+    @staticmethod
+    def _agent_frame(angle, tick, moving):
+        """Devuelve (dirección, frame) del agente como índices de la tabla de sprites."""
+        # Cuadrante más cercano: redondear a múltiplos de π/2 y envolver con & 3
+        # (floor + & 3 también resuelve ángulos negativos o de varias vueltas, sin módulo)
+        bucket = floor(angle * _QUARTERS_PER_RADIAN + 0.5) & 3
         
-        # Fallback al sprite base
-        if not sprite:
-            sprite = self.sprites.get('agent')
+        # Animación solo si está moviéndose (cambia de frame cada 8 ticks)
+        frame_idx = (tick >> 3) & 1 if moving else 0
         
-        return sprite
+        return bucket, frame_idx
+    
+    def get_agent_sprite(self, angle=0, tick=0, moving=False):
+        """Obtiene sprite del agente según dirección y animación."""
+        # Misma cuantización que _agent_frame, en línea (se llama una vez por agente y frame)
+        return self._agent_lut[floor(angle * _QUARTERS_PER_RADIAN + 0.5) & 3][(tick >> 3) & 1 if moving else 0]
     
     def get_scaled_agent_sprite(self, angle=0, tick=0, moving=False, size=(16, 16)):
         """Obtiene sprite del agente escalado con cache para mejor rendimiento."""
+        # La misma cuantización del sprite base sirve de clave de cache (sin comparaciones ni f-strings)
+        bucket, frame_idx = self._agent_frame(angle, tick, moving)
+        cache_key = (bucket, frame_idx, size)
+        
+        # Verificar cache
+        scaled_sprite = self.scaled_sprites_cache.get(cache_key)
+        if scaled_sprite is not None:
+            return scaled_sprite
+        
         # Obtener sprite base (sin escalar)
-        base_sprite = self.get_agent_sprite(angle, tick, moving)
+        base_sprite = self._agent_lut[bucket][frame_idx]
         if not base_sprite:
             return None
         
-        # Crear clave de cache: sprite_key + tamaño
-        direction = 'right' if -np.pi/4 <= angle <= np.pi/4 else \
-                  'down' if np.pi/4 < angle <= 3*np.pi/4 else \
-                  'left' if 3*np.pi/4 < angle <= 5*np.pi/4 else 'up'
-        frame = 1 if (tick // 8) % 2 == 0 else 2 if moving else 1
-        sprite_key = f'agent_{direction}_{frame}'
-        cache_key = f"{sprite_key}_{size[0]}x{size[1]}"
-        
-        # Verificar cache
-        if cache_key in self.scaled_sprites_cache:
-            return self.scaled_sprites_cache[cache_key]
-        
         # Escalar y guardar en cache
         scaled_sprite = pygame.transform.scale(base_sprite, size)
         self.scaled_sprites_cache[cache_key] = scaled_sprite
@@ -186,92 +296,203 @@ class SpriteManager:
     
     def get_environment_sprite(self, sprite_type, variant=1):
         """Obtiene sprite del entorno."""
-        if sprite_type == 'grass':
-            return self.sprites.get(f'grass_{variant}')
-        elif sprite_type == 'dirt':
-            return self.sprites.get(f'dirt_{variant}')
-        elif sprite_type == 'wall':
-            return self.sprites.get('wall')
-        elif sprite_type == 'tree':
-            return self.sprites.get('tree')
-        elif sprite_type == 'stump':
-            return self.sprites.get('stump')
-        elif sprite_type == 'water':
-            return self.sprites.get(f'water_{variant}')
-        elif sprite_type == 'hut':
-            return self.sprites.get('hut')
-        elif sprite_type == 'potion':
-            return self.sprites.get('potion')
-        elif sprite_type == 'apple':
-            return self.sprites.get('apple')
-        elif sprite_type == 'axe':
-            return self.sprites.get('axe')
-        elif sprite_type == 'grave':
-            return self.sprites.get('grave')
-        elif sprite_type == 'door':
-            return self.sprites.get('door')
-        elif sprite_type == 'door_iron':
-            return self.sprites.get('door_iron')
-        elif sprite_type == 'chest':
-            return self.sprites.get('chest')
-        elif sprite_type == 'chest_opened':
-            return self.sprites.get('chest_opened')
-        elif sprite_type == 'gold_key':
-            return self.sprites.get('gold_key')
-        elif sprite_type == 'red_key':
-            return self.sprites.get('red_key')
-        elif sprite_type == 'perimeter':
-            return self.sprites.get(f'perimeter_{variant}')
-        elif sprite_type == 'pond':
-            return self.sprites.get(f'pond_{variant}')
-        else:
-            return None
+        try:
+            return self._environment_lookup[(sprite_type, variant)]
+        except KeyError:
+            # Primera vez que se pide este (tipo, variante): resolver la clave del sprite y memorizarlo
+            key_format = self.ENVIRONMENT_SPRITE_KEYS.get(sprite_type)
+            sprite = self._get_sprite(key_format.format(variant)) if key_format else None
+            self._environment_lookup[(sprite_type, variant)] = sprite
+            return sprite
+    
+    def get_scaled_environment_sprite(self, sprite_type, variant=1, size=(20, 20)):
+        """Obtiene sprite del entorno al tamaño pedido, escalándolo una sola vez por tamaño."""
+        cache_key = (sprite_type, variant, size)
+        sprite = self.scaled_environment_cache.get(cache_key, _MISSING)
+        if sprite is not _MISSING:
+            return sprite
+        
+        # Escalar solo si el tamaño no coincide y guardar en cache
+        # (también los faltantes: el fallback de color no vuelve a buscar el sprite en cada frame)
+        sprite = self.get_environment_sprite(sprite_type, variant)
+        if sprite and sprite.get_size() != size:
+            sprite = pygame.transform.scale(sprite, size)
+        self.scaled_environment_cache[cache_key] = sprite or None
+        return sprite or None
+    
+    def get_glow_sprites(self, sprite_type, glow_color):
+        """Halo de 3 anillos y sprite abrillantado de un objeto destacado, construidos una vez por color.
+        Devuelve (((halo, radio), ...), overlay) o None si no hay sprite.
+        """
+        cache_key = ('glow', sprite_type, glow_color)
+        glow = self.scaled_environment_cache.get(cache_key)
+        if glow is None:
+            sprite = self.get_environment_sprite(sprite_type)
+            if not sprite:
+                return None
+            halos = []
+            for i in range(3):
+                glow_radius = 15 + i * 5
+                glow_alpha = 30 - i * 8  # Más transparente
+                halo = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(halo, (*glow_color, glow_alpha), (glow_radius, glow_radius), glow_radius)
+                halos.append((self._to_display_format(halo), glow_radius))
+            # Brillo sutil encima del sprite (sin fondo)
+            overlay = pygame.Surface(sprite.get_size(), pygame.SRCALPHA)
+            overlay.fill((*glow_color, 30))  # Muy transparente
+            overlay.blit(sprite, (0, 0), special_flags=pygame.BLEND_ADD)
+            glow = (tuple(halos), self._to_display_format(overlay))
+            self.scaled_environment_cache[cache_key] = glow
+        return glow
+    
+    def get_water_sprites(self, size=(20, 20)):
+        """Par de frames del agua animada al tamaño pedido; se indexa con (tick // 10) & 1."""
+        cache_key = ('water_frames', size)
+        frames = self.scaled_environment_cache.get(cache_key)
+        if frames is None:
+            frames = (self.get_scaled_environment_sprite('water', 1, size),
+                      self.get_scaled_environment_sprite('water', 2, size))
+            self.scaled_environment_cache[cache_key] = frames
+        return frames
+    
+    def current_water_sprite(self, tick, size=(20, 20)):
+        """Frame del agua animada para este tick; solo se resuelve cuando cambia (cada 10 ticks) o el tamaño."""
+        key = (tick // 10, size)
+        if key != self._water_frame_key:
+            self._water_frame = self.get_water_sprites(size)[key[0] & 1]
+            self._water_frame_key = key
+        return self._water_frame
+
+
+def _update_particles(x, y, vx, vy, life, color, ix, iy, n, radius):
+    """Integra y compacta las partículas en una sola pasada (dos punteros); devuelve cuántas siguen vivas."""
+    j = 0
+    for i in range(n):
+        remaining = life[i] - 1
+        if remaining > 0:
+            x[j] = x[i] + vx[i]
+            y[j] = y[i] + vy[i]
+            vx[j] = vx[i]
+            vy[j] = vy[i]
+            life[j] = remaining
+            color[j, 0] = color[i, 0]
+            color[j, 1] = color[i, 1]
+            color[j, 2] = color[i, 2]
+            ix[j] = int(x[j]) - radius
+            iy[j] = int(y[j]) - radius
+            j += 1
+    return j
+
+
+# Kernel compilado (solo si Numba está instalado; en Python puro sería más lento que NumPy)
+_update_particles_kernel = njit(cache=True)(_update_particles) if njit is not None else None
 
 
 class ParticleSystem:
     """Sistema de partículas para efectos visuales."""
     
-    def __init__(self):
-        self.particles = []
+    MAX_PARTICLES = 4096  # Capacidad de los buffers preasignados
+    PARTICLE_RADIUS = 2
+    
+    def __init__(self, capacity=MAX_PARTICLES):
+        # Estructura de arrays (SoA): un buffer por campo, activas en [0, count)
+        self.capacity = capacity
+        self._x = np.zeros(capacity, dtype=np.float32)
+        self._y = np.zeros(capacity, dtype=np.float32)
+        self._vx = np.zeros(capacity, dtype=np.float32)
+        self._vy = np.zeros(capacity, dtype=np.float32)
+        self._life = np.zeros(capacity, dtype=np.int16)
+        self._color = np.zeros((capacity, 3), dtype=np.uint8)
+        # Esquina de dibujo en píxeles enteros, recalculada solo al mover (draw corre más seguido que update)
+        self._ix = np.zeros(capacity, dtype=np.int32)
+        self._iy = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+        self._rng = np.random.default_rng()  # Generador propio (sin el estado global de np.random)
+        self._circle_cache = {}  # Círculo pre-rasterizado por color
+    
+    def _get_circle_sprite(self, color):
+        """Obtiene (o crea una vez) el círculo de partícula ya rasterizado para ese color."""
+        sprite = self._circle_cache.get(color)
+        if sprite is None:
+            radius = self.PARTICLE_RADIUS
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self._circle_cache[color] = sprite
+        return sprite
+    
+    def _spawn(self, x, y, amount, spread, speed, life, color):
+        """Escribe `amount` partículas nuevas en los siguientes slots libres."""
+        start = self.count
+        amount = min(amount, self.capacity - start)  # Buffer lleno: se descartan las sobrantes
+        if amount <= 0:
+            return
+        end = start + amount
+        
+        # Offsets y velocidades de toda la ráfaga en dos llamadas al RNG
+        offsets = self._rng.integers(-spread, spread, size=(2, amount), endpoint=True)
+        velocities = self._rng.uniform(-speed, speed, size=(2, amount))
+        self._x[start:end] = x + offsets[0]
+        self._y[start:end] = y + offsets[1]
+        self._vx[start:end] = velocities[0]
+        self._vy[start:end] = velocities[1]
+        self._life[start:end] = life
+        self._color[start:end] = color
+        self._ix[start:end] = self._x[start:end]
+        self._iy[start:end] = self._y[start:end]
+        self._ix[start:end] -= self.PARTICLE_RADIUS
+        self._iy[start:end] -= self.PARTICLE_RADIUS
+        self.count = end
     
     def add_death_effect(self, x, y):
         """Agrega efecto de muerte."""
-        for _ in range(5):
-            particle = {
-                'x': x + random.randint(-10, 10),
-                'y': y + random.randint(-10, 10),
-                'vx': random.uniform(-2, 2),
-                'vy': random.uniform(-2, 2),
-                'life': 30,
-                'color': (255, 0, 0)
-            }
-            self.particles.append(particle)
+        self._spawn(x, y, amount=5, spread=10, speed=2, life=30, color=(255, 0, 0))
     
     def add_food_effect(self, x, y):
         """Agrega efecto de comer comida."""
-        for _ in range(3):
-            particle = {
-                'x': x + random.randint(-5, 5),
-                'y': y + random.randint(-5, 5),
-                'vx': random.uniform(-1, 1),
-                'vy': random.uniform(-1, 1),
-                'life': 20,
-                'color': (0, 255, 0)
-            }
-            self.particles.append(particle)
+        self._spawn(x, y, amount=3, spread=5, speed=1, life=20, color=(0, 255, 0))
     
     def update(self):
         """Actualiza todas las partículas."""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        n = self.count
+        if n == 0:
+            return
+        
+        if _update_particles_kernel is not None:
+            # Integración y compactación fusionadas, sin arrays temporales
+            self.count = _update_particles_kernel(self._x, self._y, self._vx, self._vy, self._life,
+                                                  self._color, self._ix, self._iy, n, self.PARTICLE_RADIUS)
+            return
+        
+        # Integración vectorizada sobre los slots activos
+        self._x[:n] += self._vx[:n]
+        self._y[:n] += self._vy[:n]
+        self._life[:n] -= 1
+        
+        # Compactar las vivas al inicio de los buffers
+        alive = self._life[:n] > 0
+        remaining = int(np.count_nonzero(alive))
+        if remaining != n:
+            for buffer in (self._x, self._y, self._vx, self._vy, self._life, self._color):
+                buffer[:remaining] = buffer[:n][alive]
+            self.count = remaining
+        
+        # Truncar a enteros una vez por actualización (misma semántica que int()) y desplazar al borde
+        self._ix[:remaining] = self._x[:remaining]
+        self._iy[:remaining] = self._y[:remaining]
+        self._ix[:remaining] -= self.PARTICLE_RADIUS
+        self._iy[:remaining] -= self.PARTICLE_RADIUS
     
     def draw(self, screen):
         """Dibuja todas las partículas."""
-        for particle in self.particles:
-            pygame.draw.circle(screen, particle['color'], 
-                             (int(particle['x']), int(particle['y'])), 2)
\ No newline at end of file
+        n = self.count
+        if n == 0:
+            return
+        
+        # Un único blits() con el círculo pre-rasterizado de cada color
+        circle = self._get_circle_sprite
+        screen.blits([
+            (circle(tuple(color)), (x, y))
+            for x, y, color in zip(self._ix[:n].tolist(), self._iy[:n].tolist(), self._color[:n].tolist())
+        ], False)
@@ -4,68 +4,80 @@ Panel de estadísticas en tiempo real.
 
 import pygame
 
+from config import SimulationConfig
+from .fonts import get_freetype_font, render_freetype_text
+
 
 class StatsPanel:
     """Panel de estadísticas en tiempo real."""
     
+    # Plantillas de las estadísticas básicas (se formatean con format_map)
+    STAT_TEMPLATES = (
+        "Generación: {generation}",
+        "Tiempo: {time}",
+        "Vivos: {alive}",
+        "Muertos: {dead}",
+        "Comida: {food}",
+    )
+    
+    FONT_SIZE = 20
+    TEXT_COLOR = (200, 200, 200)
+    
     def __init__(self, x, y, width, height):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.font = pygame.font.Font(None, 20)
-        self.title_font = pygame.font.Font(None, 24)
+        self.font = get_freetype_font(self.FONT_SIZE)
+        self.title_font = get_freetype_font(24)
+        
+        # Cache del panel renderizado (se reconstruye solo cuando cambian los datos)
+        self.update_frequency = max(1, SimulationConfig.STATS_UPDATE_FREQUENCY)
+        self._panel_surface = None
+        self._last_stats = None
+        self._frame_count = 0
+        # Texto mm:ss del último segundo mostrado (solo se reformatea cuando cambia el segundo)
+        self._last_second = -1
+        self._time_str = "00:00"
+        # Fondo, bordes, título y separador no cambian nunca: se dibujan una sola vez
+        self._background = self._render_background()
     
     def draw_background(self, screen):
         """Dibuja solo el fondo del panel sin actualizar datos."""
-        # Fondo del panel con gradiente
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        pygame.draw.rect(screen, (25, 25, 40), panel_rect)
-        pygame.draw.rect(screen, (60, 60, 90), panel_rect, 3)
-        
-        # Borde interno más sutil
-        inner_rect = pygame.Rect(self.x + 2, self.y + 2, self.width - 4, self.height - 4)
-        pygame.draw.rect(screen, (40, 40, 60), inner_rect, 1)
-        
-        # Título con efecto
-        title = self.title_font.render("* ECOSISTEMA EVOLUTIVO *", True, (100, 255, 150))
-        screen.blit(title, (self.x + 10, self.y + 10))
-        
-        # Línea separadora
-        pygame.draw.line(screen, (100, 255, 150), (self.x + 10, self.y + 35), (self.x + self.width - 10, self.y + 35), 2)
+        screen.blit(self._background, (self.x, self.y))
     
     def draw(self, screen, generation, agents, world, tick):
         """Dibuja el panel de estadísticas simplificado."""
-        # Fondo del panel
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        pygame.draw.rect(screen, (25, 25, 40), panel_rect)
-        pygame.draw.rect(screen, (60, 60, 90), panel_rect, 3)
-        
-        # Título
-        title = self.title_font.render("* ECOSISTEMA *", True, (100, 255, 150))
-        screen.blit(title, (self.x + 10, self.y + 10))
-        
-        # Línea separadora
-        pygame.draw.line(screen, (100, 255, 150), (self.x + 10, self.y + 35), (self.x + self.width - 10, self.y + 35), 2)
+        # Recalcular solo cada N frames; el panel se re-rasteriza solo si cambió algún dato
+        if self._panel_surface is None or self._frame_count % self.update_frequency == 0:
+            stats = self._collect_stats(generation, agents, world, tick)
+            if stats != self._last_stats:
+                self._last_stats = stats
+                self._panel_surface = self._render_panel(stats)
+        self._frame_count += 1
         
-        # Calcular estadísticas básicas
-        alive_agents = [a for a in agents if a.alive]
-        dead_agents = [a for a in agents if not a.alive]
+        screen.blit(self._panel_surface, (self.x, self.y))
+    
+    def _collect_stats(self, generation, agents, world, tick):
+        """Calcula las líneas de texto del panel."""
+        # Contadores mantenidos por el mundo (sin recorrer agentes ni comida)
+        alive = world.alive_agents_count
         
         # Mostrar tiempo en formato mm:ss
         total_seconds = tick // 60
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-        time_str = f"{minutes:02d}:{seconds:02d}"
+        if total_seconds != self._last_second:
+            self._last_second = total_seconds
+            self._time_str = f"{total_seconds // 60:02d}:{total_seconds % 60:02d}"
         
         # Solo 5 datos básicos
-        stats = [
-            f"Generación: {generation}",
-            f"Tiempo: {time_str}",
-            f"Vivos: {len(alive_agents)}",
-            f"Muertos: {len(dead_agents)}",
-            f"Comida: {len([f for f in world.food_items if not f['eaten']])}"
-        ]
+        values = {
+            'generation': generation,
+            'time': self._time_str,
+            'alive': alive,
+            'dead': len(agents) - alive,
+            'food': world.food_remaining
+        }
+        stats = [template.format_map(values) for template in self.STAT_TEMPLATES]
         
         # Añadir texto de corte de árboles si está activo
         if hasattr(world, 'axe_picked_up') and world.axe_picked_up:
@@ -77,9 +89,34 @@ class StatsPanel:
         if hasattr(world, 'gold_key_collected') and world.gold_key_collected:
             stats.append("* Pueden abrir puerta hierro!")
         
-        # Dibujar estadísticas
-        y_offset = 50
-        for stat in stats:
-            text = self.font.render(stat, True, (200, 200, 200))
-            screen.blit(text, (self.x + 10, self.y + y_offset))
-            y_offset += 25
+        return stats
+    
+    def _render_background(self):
+        """Rasteriza la parte estática del panel (fondo, bordes, título y separador)."""
+        background = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            background = background.convert()  # Formato de pantalla (en modo headless no hay ventana)
+        
+        # Fondo del panel
+        panel_rect = background.get_rect()
+        pygame.draw.rect(background, (25, 25, 40), panel_rect)
+        pygame.draw.rect(background, (60, 60, 90), panel_rect, 3)
+        
+        # Título (FreeType dibuja directamente sobre el panel, sin superficie intermedia)
+        self.title_font.render_to(background, (10, 10), "* ECOSISTEMA *", (100, 255, 150))
+        
+        # Línea separadora
+        pygame.draw.line(background, (100, 255, 150), (10, 35), (self.width - 10, 35), 2)
+        
+        return background
+    
+    def _render_panel(self, stats):
+        """Rasteriza el panel completo en una superficie propia."""
+        # Partir del fondo pre-renderizado: solo el texto de las estadísticas es dinámico
+        panel_surface = self._background.copy()
+        
+        # Dibujar estadísticas en una sola llamada (sin recorrer blit a blit desde Python)
+        panel_surface.blits([(render_freetype_text(stat, self.FONT_SIZE, self.TEXT_COLOR), (10, 50 + i * 25))
+                             for i, stat in enumerate(stats)], False)
+        
+        return panel_surface
@@ -0,0 +1,30 @@
+"""
+Kernel compilado (Numba, opcional) para los efectos de zona de los obstáculos.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # Numba es opcional: sin él se usa el recorrido por SpatialHash en Python
+    njit = None
+
+from .obstacles import OBSTACLE_TYPE_IDS
+
+# Tipos con efecto de zona (constantes enteras: Numba las congela al compilar)
+WATER = OBSTACLE_TYPE_IDS["water"]
+SAFE = OBSTACLE_TYPE_IDS["safe"]
+
+
+def _zone_rows(ax, ay, radius, cx, cy, hw, hh, type_id, active, out):
+    """Escribe en out las filas de agua/zona segura que tocan el círculo; devuelve cuántas son."""
+    count = 0
+    for i in range(cx.shape[0]):
+        t = type_id[i]
+        if (t == WATER or t == SAFE) and active[i]:
+            if abs(ax - cx[i]) <= hw[i] + radius and abs(ay - cy[i]) <= hh[i] + radius:
+                out[count] = i
+                count += 1
+    return count
+
+
+# Kernel compilado (solo si Numba está instalado); cache=True guarda el binario entre ejecuciones
+zone_rows_kernel = njit(cache=True, fastmath=True)(_zone_rows) if njit is not None else None
@@ -0,0 +1,131 @@
+"""
+Colisiones vectorizadas: geometría de los obstáculos en columnas numpy (SoA).
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .obstacles import OBSTACLE_TYPE_IDS, CUTTABLE_TYPES
+from ._collision_numba import zone_rows_kernel
+
+
+# Tipos que bloquean el paso de los agentes (el agua y las pociones no)
+BLOCKING_TYPE_IDS = tuple(OBSTACLE_TYPE_IDS[t] for t in ("wall", "tree", "hut"))
+
+
+@dataclass(slots=True)
+class CollisionArrays:
+    """Centro, semi-extensiones, tipo y estado de cada obstáculo en arreglos paralelos.
+
+    Las máscaras devueltas reutilizan buffers internos: son válidas hasta la siguiente consulta.
+    """
+    cx: np.ndarray
+    cy: np.ndarray
+    hw: np.ndarray
+    hh: np.ndarray
+    type_id: np.ndarray  # int8 (OBSTACLE_TYPE_IDS)
+    active: np.ndarray   # False para árboles/huts cortados
+    blocking: np.ndarray
+    rows: dict           # id(obstáculo) -> fila
+    _dist: np.ndarray = field(init=False)
+    _reach: np.ndarray = field(init=False)
+    _hits: np.ndarray = field(init=False)
+    _hits_y: np.ndarray = field(init=False)
+    _rows_out: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        count = len(self.cx)
+        self._dist = np.empty(count, np.float64)
+        self._reach = np.empty(count, np.float64)
+        self._hits = np.empty(count, np.bool_)
+        self._hits_y = np.empty(count, np.bool_)
+        self._rows_out = np.empty(count, np.int64)
+
+    @classmethod
+    def from_obstacles(cls, obstacles):
+        """Construye las columnas a partir de una lista de Obstacle."""
+        count = len(obstacles)
+        type_id = np.fromiter((o._type_id for o in obstacles), np.int8, count)
+        return cls(
+            cx=np.fromiter((o._cx for o in obstacles), np.float64, count),
+            cy=np.fromiter((o._cy for o in obstacles), np.float64, count),
+            hw=np.fromiter((o._hw for o in obstacles), np.float64, count),
+            hh=np.fromiter((o._hh for o in obstacles), np.float64, count),
+            type_id=type_id,
+            # Los árboles/huts cortados dejan de colisionar (igual que Obstacle.collides_with)
+            active=np.fromiter((not (o.is_cut and o.type in CUTTABLE_TYPES) for o in obstacles), np.bool_, count),
+            blocking=np.isin(type_id, BLOCKING_TYPE_IDS),
+            rows={id(o): row for row, o in enumerate(obstacles)},
+        )
+
+    def set_active(self, obstacle, active):
+        """Actualiza en el lugar si un obstáculo colisiona (p. ej. al cortarse), sin reconstruir las columnas."""
+        row = self.rows.get(id(obstacle))
+        if row is not None:
+            self.active[row] = active
+
+    def collision_mask(self, ax, ay, radius, blocking_only=False):
+        """Máscara de obstáculos que colisionan con un círculo en (ax, ay), sin reservar memoria por consulta."""
+        dist, reach, hits, hits_y = self._dist, self._reach, self._hits, self._hits_y
+        np.subtract(self.cx, ax, out=dist)
+        np.abs(dist, out=dist)
+        np.add(self.hw, radius, out=reach)
+        np.less_equal(dist, reach, out=hits)
+        np.subtract(self.cy, ay, out=dist)
+        np.abs(dist, out=dist)
+        np.add(self.hh, radius, out=reach)
+        np.less_equal(dist, reach, out=hits_y)
+        hits &= hits_y
+        hits &= self.active
+        if blocking_only:
+            hits &= self.blocking
+        return hits
+
+    def collides_many(self, ax, ay, radius, blocking_only=False):
+        """Índices (filas) de los obstáculos que colisionan con el círculo."""
+        return np.flatnonzero(self.collision_mask(ax, ay, radius, blocking_only))
+
+    def zone_rows(self, ax, ay, radius):
+        """Filas de agua/zona segura que tocan el círculo, en orden, con el kernel Numba (requiere Numba)."""
+        count = zone_rows_kernel(float(ax), float(ay), float(radius), self.cx, self.cy, self.hw, self.hh,
+                                 self.type_id, self.active, self._rows_out)
+        return self._rows_out[:count]
+
+
+# Lado de celda del índice espacial (2 tiles de 20 px)
+SPATIAL_CELL_SIZE = 40
+
+
+class SpatialHash:
+    """Índice de objetos rectangulares (x, y, width, height) por celdas fijas de la rejilla.
+
+    Pensado para colecciones casi estáticas: se reconstruye entero cuando la lista cambia.
+    """
+    __slots__ = ('cell_size', 'items', '_buckets')
+
+    def __init__(self, items, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.items = list(items)
+        buckets = {}
+        for index, item in enumerate(self.items):
+            for key in self._cells(item.x, item.y, item.x + item.width, item.y + item.height):
+                buckets.setdefault(key, []).append(index)
+        self._buckets = buckets
+
+    def _cells(self, x0, y0, x1, y1):
+        """Claves (col, fila) de las celdas que toca la caja [x0, x1] x [y0, y1]."""
+        cell = self.cell_size
+        rows = range(int(y0 // cell), int(y1 // cell) + 1)
+        return [(col, row) for col in range(int(x0 // cell), int(x1 // cell) + 1) for row in rows]
+
+    def query(self, x0, y0, x1, y1):
+        """Candidatos que comparten celda con la caja, sin duplicados y en el orden de la lista original."""
+        buckets = self._buckets
+        indices = set()
+        for key in self._cells(x0, y0, x1, y1):
+            bucket = buckets.get(key)
+            if bucket:
+                indices.update(bucket)
+        items = self.items
+        return [items[index] for index in sorted(indices)]
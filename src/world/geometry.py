@@ -0,0 +1,17 @@
+"""
+Geometría básica compartida por el mundo y los obstáculos: distancias y alcance.
+"""
+
+import numpy as np
+
+
+def distances_one_to_many(px, py, xs, ys):
+    """Distancias desde (px, py) a todos los puntos (xs, ys) en una sola operación vectorizada."""
+    return np.hypot(xs - px, ys - py)
+
+
+def within_radius(px, py, cx, cy, r):
+    """Indica si (px, py) está a menos de r de (cx, cy), comparando distancias al cuadrado (sin raíz)."""
+    dx = px - cx
+    dy = py - cy
+    return dx * dx + dy * dy < r * r
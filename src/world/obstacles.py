@@ -5,16 +5,126 @@ Obstáculos del mundo: paredes, árboles, agua, casitas, pociones.
 import pygame
 import random
 
+from config import SimulationConfig
+from src.ui.fonts import render_text
+from .geometry import within_radius
 
-class Obstacle:
-    """Obstáculo del mundo."""
+
+# Identificador entero por tipo de obstáculo (columnas numpy de colisión, despacho sin comparar strings)
+OBSTACLE_TYPE_IDS = {"wall": 1, "tree": 2, "water": 3, "hut": 4, "potion": 5, "safe": 6}
+# Tipos que dejan de colisionar al cortarse/destruirse
+CUTTABLE_TYPES = ("tree", "hut")
+WALL_ID = OBSTACLE_TYPE_IDS["wall"]
+TREE_ID = OBSTACLE_TYPE_IDS["tree"]
+WATER_ID = OBSTACLE_TYPE_IDS["water"]
+HUT_ID = OBSTACLE_TYPE_IDS["hut"]
+POTION_ID = OBSTACLE_TYPE_IDS["potion"]
+SAFE_ID = OBSTACLE_TYPE_IDS["safe"]
+_CUTTABLE_IDS = frozenset(OBSTACLE_TYPE_IDS[t] for t in CUTTABLE_TYPES)
+
+# Constantes de configuración leídas una sola vez al importar (no cambian durante la simulación)
+_WATER_PENALTY = SimulationConfig.WATER_FITNESS_PENALTY
+_HUT_HITS = SimulationConfig.HUT_HITS_TO_CUT
+_DOOR_HITS = SimulationConfig.DOOR_HITS_TO_OPEN
+_IRON_DOOR_HITS = SimulationConfig.DOOR_IRON_HITS_TO_OPEN
+
+# Efectos de zona por tipo: (pérdida de energía, factor de velocidad, pérdida de fitness).
+# Tuplas inmutables creadas una sola vez
+_EFFECT_NONE = (0.0, 1.0, 0.0)
+_EFFECTS = {
+    WATER_ID: (0.05, 0.8, _WATER_PENALTY),
+    SAFE_ID: (-2.0, 1.2, 0.0),  # Energía negativa = ganancia
+}
+
+
+# Sprite de cada tipo de obstáculo, ya escalado a su tamaño (se escala una vez y queda en cache).
+# Cada función recibe (obstáculo, sprite_manager, tick); Obstacle guarda la suya en __init__.
+def _wall_sprite(obstacle, sprite_manager, tick):
+    return sprite_manager.get_scaled_environment_sprite('wall', size=obstacle._size)
+
+
+def _tree_sprite(obstacle, sprite_manager, tick):
+    # Tronco cortado o árbol en pie
+    return sprite_manager.get_scaled_environment_sprite('stump' if obstacle.is_cut else 'tree', size=obstacle._size)
+
+
+def _water_sprite(obstacle, sprite_manager, tick):
+    # Alternar entre dos sprites de agua para efecto animado
+    return sprite_manager.current_water_sprite(tick, obstacle._size)
+
+
+def _hut_sprite(obstacle, sprite_manager, tick):
+    return sprite_manager.get_scaled_environment_sprite('hut', size=obstacle._size)
+
+
+def _potion_sprite(obstacle, sprite_manager, tick):
+    return sprite_manager.get_scaled_environment_sprite('potion', size=obstacle._size)
+
+
+def _no_sprite(obstacle, sprite_manager, tick):
+    return None
+
+
+_SPRITE_TABLE = {
+    WALL_ID: _wall_sprite,
+    TREE_ID: _tree_sprite,
+    WATER_ID: _water_sprite,
+    HUT_ID: _hut_sprite,
+    POTION_ID: _potion_sprite,
+}
+
+
+class _RectObstacle:
+    """Rectángulo fijo con bordes precalculados y la prueba de colisión contra un círculo compartida."""
     
-    def __init__(self, x, y, width, height, obstacle_type):
+    __slots__ = ('x', 'y', 'width', 'height', '_hw', '_hh', '_cx', '_cy', '_left', '_right', '_top', '_bottom')
+    
+    def __init__(self, x, y, width, height):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        # Centro y semi-extensiones precalculados (el rectángulo no se mueve)
+        self._hw = width // 2
+        self._hh = height // 2
+        self._cx = x + self._hw
+        self._cy = y + self._hh
+        # Bordes del rectángulo centrado: collides_with solo resta el radio y compara
+        self._left = self._cx - self._hw
+        self._right = self._cx + self._hw
+        self._top = self._cy - self._hh
+        self._bottom = self._cy + self._hh
+    
+    def collides_with(self, x, y, radius):
+        """Verifica si el círculo (x, y, radius) toca el rectángulo."""
+        # Dentro del rectángulo expandido por el radio (comparaciones encadenadas contra bordes precalculados)
+        return (self._left - radius <= x <= self._right + radius and
+                self._top - radius <= y <= self._bottom + radius)
+
+
+class Obstacle(_RectObstacle):
+    """Obstáculo del mundo."""
+    
+    # Sin __dict__ por instancia: hay cientos de obstáculos y se recorren en cada tick
+    __slots__ = ('type', 'collision_count', 'is_cut', 'can_be_cut', '_type_id',
+                 '_size', '_sprite_fn', 'last_hit_tick')
+    
+    # Colores de fallback por tipo (tabla construida una sola vez)
+    FALLBACK_COLORS = {
+        "wall": (100, 100, 100),
+        "tree": (34, 139, 34),
+        "water": (0, 100, 200),
+        "hut": (139, 69, 19),
+        "potion": (255, 0, 0)
+    }
+    DEFAULT_COLOR = (128, 128, 128)
+    
+    def __init__(self, x, y, width, height, obstacle_type):
+        super().__init__(x, y, width, height)
         self.type = obstacle_type
+        self._type_id = OBSTACLE_TYPE_IDS.get(obstacle_type, 0)  # Comparaciones enteras en el camino caliente
+        self._size = (width, height)
+        self._sprite_fn = _SPRITE_TABLE.get(self._type_id, _no_sprite)  # Sin cadena if/elif por frame
         self.collision_count = 0  # Para sistema de cortar árboles
         self.is_cut = False  # Si el árbol fue cortado
         self.can_be_cut = False  # Si puede ser cortado (cuando hay ≤5 manzanas)
@@ -22,55 +132,19 @@ class Obstacle:
     def collides_with(self, x, y, radius):
         """Verifica si hay colisión con el obstáculo."""
         # Si el árbol o hut está cortado/destruido, no hay colisión
-        if (self.type == "tree" or self.type == "hut") and self.is_cut:
+        if self.is_cut and self._type_id in _CUTTABLE_IDS:
             return False
         
-        # Calcular distancia desde el centro del obstáculo
-        dx = abs(x - (self.x + self.width // 2))
-        dy = abs(y - (self.y + self.height // 2))
-        
-        # Si está fuera del rectángulo expandido, no hay colisión
-        if dx > (self.width // 2 + radius):
-            return False
-        if dy > (self.height // 2 + radius):
-            return False
-        
-        # Si está dentro del rectángulo expandido, hay colisión
-        return True
+        return super().collides_with(x, y, radius)
     
     def get_effect(self):
-        """Obtiene el efecto del obstáculo."""
-        if self.type == "water":
-            from config import SimulationConfig
-            return {"energy_loss": 0.05, "speed_reduction": 0.8, "fitness_loss": SimulationConfig.WATER_FITNESS_PENALTY}
-        elif self.type == "safe":
-            return {"energy_gain": 2, "speed_boost": 1.2}
-        return {"energy_loss": 0, "speed_reduction": 1.0}
+        """Obtiene el efecto del obstáculo: (pérdida de energía, factor de velocidad, pérdida de fitness)."""
+        return _EFFECTS.get(self._type_id, _EFFECT_NONE)
     
     def draw(self, screen, sprite_manager, tick):
         """Dibuja el obstáculo."""
-        if self.type == "wall":
-            sprite = sprite_manager.get_environment_sprite('wall')
-        elif self.type == "tree":
-            if self.is_cut:
-                sprite = sprite_manager.get_environment_sprite('stump')  # Tronco cortado
-            else:
-                sprite = sprite_manager.get_environment_sprite('tree')
-        elif self.type == "water":
-            # Alternar entre dos sprites de agua para efecto animado
-            water_variant = 1 if (tick // 10) % 2 == 0 else 2
-            sprite = sprite_manager.get_environment_sprite('water', water_variant)
-        elif self.type == "hut":
-            sprite = sprite_manager.get_environment_sprite('hut')
-        elif self.type == "potion":
-            sprite = sprite_manager.get_environment_sprite('potion')
-        else:
-            sprite = None
-        
+        sprite = self._sprite_fn(self, sprite_manager, tick)
         if sprite:
-            # Escalar sprite si es necesario para que coincida con el tamaño del obstáculo
-            if sprite.get_width() != self.width or sprite.get_height() != self.height:
-                sprite = pygame.transform.scale(sprite, (self.width, self.height))
             screen.blit(sprite, (self.x, self.y))
         else:
             # Fallback: dibujar rectángulo de color
@@ -79,67 +153,20 @@ class Obstacle:
         
         # NO dibujar barra de vida para árboles y huts (solo para puertas)
     
-    # MÉTODO COMENTADO - Ya no se usa para árboles y huts
-    # def _draw_hit_counter(self, screen):
-    #     """Dibuja la barra de vida del obstáculo (árbol o hut)."""
-    #     from config import SimulationConfig
-    #     
-    #     # Determinar golpes necesarios según el tipo
-    #     if self.type == "tree":
-    #         max_hits = SimulationConfig.TREE_HITS_TO_CUT
-    #         hits_remaining = max_hits - self.collision_count
-    #     elif self.type == "hut":
-    #         max_hits = SimulationConfig.HUT_HITS_TO_CUT  # Usar config
-    #         hits_remaining = max_hits - self.collision_count
-    #     else:
-    #         return
-    #     
-    #     if hits_remaining > 0:
-    #         # Calcular progreso de vida
-    #         health_ratio = hits_remaining / max_hits
-    #         
-    #         # Dimensiones de la barra
-    #         bar_width = 20
-    #         bar_height = 4
-    #         bar_x = self.x + self.width // 2 - bar_width // 2
-    #         bar_y = self.y - 10
-    #         
-    #         # Fondo de la barra (rojo)
-    #         bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-    #         pygame.draw.rect(screen, (255, 0, 0), bg_rect)
-    #         
-    #         # Barra de vida (verde)
-    #         health_width = int(bar_width * health_ratio)
-    #         if health_width > 0:
-    #             health_rect = pygame.Rect(bar_x, bar_y, health_width, bar_height)
-    #             pygame.draw.rect(screen, (0, 255, 0), health_rect)
-    #         
-    #         # Borde de la barra
-    #         pygame.draw.rect(screen, (255, 255, 255), bg_rect, 1)
-    
     def _get_color(self):
         """Obtiene el color del obstáculo."""
-        colors = {
-            "wall": (100, 100, 100),
-            "tree": (34, 139, 34),
-            "water": (0, 100, 200),
-            "hut": (139, 69, 19),
-            "potion": (255, 0, 0)
-        }
-        return colors.get(self.type, (128, 128, 128))
+        return self.FALLBACK_COLORS.get(self.type, self.DEFAULT_COLOR)
     
     def hit(self):
         """Registra un golpe al obstáculo (para sistema de cortar árboles y huts)."""
-        from config import SimulationConfig
-        
-        if self.type == "tree" and self.can_be_cut and not self.is_cut:
+        if self._type_id == TREE_ID and self.can_be_cut and not self.is_cut:
             self.collision_count += 1
             if self.collision_count >= 3:  # 3 golpes para árboles
                 self.is_cut = True
                 return True  # Árbol cortado
-        elif self.type == "hut" and not self.is_cut:
+        elif self._type_id == HUT_ID and not self.is_cut:
             self.collision_count += 1
-            if self.collision_count >= SimulationConfig.HUT_HITS_TO_CUT:  # Usar config
+            if self.collision_count >= _HUT_HITS:  # Usar config
                 self.is_cut = True
                 return True  # Hut destruido
         return False
@@ -148,6 +175,8 @@ class Obstacle:
 class Axe:
     """Hacha que permite cortar árboles."""
     
+    __slots__ = ('x', 'y', 'collected', 'collected_by', 'radius')
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -157,10 +186,7 @@ class Axe:
     
     def collides_with(self, x, y, radius):
         """Verifica si hay colisión con el hacha."""
-        dx = abs(x - self.x)
-        dy = abs(y - self.y)
-        distance = (dx**2 + dy**2)**0.5
-        return distance < (self.radius + radius)
+        return within_radius(x, y, self.x, self.y, self.radius + radius)
     
     def collect(self, agent):
         """Recoge el hacha."""
@@ -185,6 +211,8 @@ class Axe:
 class Key:
     """Llave que permite abrir puertas."""
     
+    __slots__ = ('x', 'y', 'key_type', 'collected', 'collected_by', 'radius')
+    
     def __init__(self, x, y, key_type):
         self.x = x
         self.y = y
@@ -195,10 +223,7 @@ class Key:
     
     def collides_with(self, x, y, radius):
         """Verifica si hay colisión con la llave."""
-        dx = abs(x - self.x)
-        dy = abs(y - self.y)
-        distance = (dx**2 + dy**2)**0.5
-        return distance < (self.radius + radius)
+        return within_radius(x, y, self.x, self.y, self.radius + radius)
     
     def collect(self, agent):
         """Recoge la llave."""
@@ -225,24 +250,23 @@ class Key:
                 pygame.draw.circle(screen, (200, 0, 0) if self.key_type == "red_key" else (200, 170, 0), 
                                  (int(self.x), int(self.y)), 6)
                 # Texto "K" para identificar
-                font = pygame.font.Font(None, 16)
-                text = font.render("K", True, (255, 255, 255))
+                text = render_text("K", 16, (255, 255, 255))  # Fuente y superficie cacheadas
                 text_rect = text.get_rect(center=(int(self.x), int(self.y)))
                 screen.blit(text, text_rect)
 
 
-class Door:
+class Door(_RectObstacle):
     """Puerta que requiere llave para abrir."""
     
+    __slots__ = ('door_type', '_max_hits', 'is_open', 'hit_count', 'last_hit_tick')
+    
     def __init__(self, x, y, door_type):
-        self.x = x
-        self.y = y
+        super().__init__(x, y, 20, 20)  # Mismo tamaño que otros elementos
         self.door_type = door_type  # "door" o "door_iron"
+        self._max_hits = _DOOR_HITS if door_type == "door" else _IRON_DOOR_HITS  # Golpes para abrirla
         self.is_open = False
         self.hit_count = 0
         self.last_hit_tick = 0
-        self.width = 20  # Mismo tamaño que otros elementos
-        self.height = 20
     
     def collides_with(self, x, y, radius):
         """Verifica si hay colisión con la puerta."""
@@ -250,16 +274,8 @@ class Door:
             # Cuando la puerta está abierta, NO hay colisión - los agentes pueden pasar libremente
             return False
         
-        # Puerta cerrada: colisión normal
-        dx = abs(x - (self.x + self.width // 2))
-        dy = abs(y - (self.y + self.height // 2))
-        
-        if dx > (self.width // 2 + radius):
-            return False
-        if dy > (self.height // 2 + radius):
-            return False
-        
-        return True
+        # Puerta cerrada: colisión normal con el rectángulo expandido por el radio
+        return super().collides_with(x, y, radius)
     
     def hit(self, current_tick, cooldown):
         """Registra un golpe a la puerta."""
@@ -273,10 +289,7 @@ class Door:
         self.hit_count += 1
         self.last_hit_tick = current_tick
         
-        from config import SimulationConfig
-        max_hits = SimulationConfig.DOOR_HITS_TO_OPEN if self.door_type == "door" else SimulationConfig.DOOR_IRON_HITS_TO_OPEN
-        
-        if self.hit_count >= max_hits:
+        if self.hit_count >= self._max_hits:
             self.is_open = True
             return True  # Puerta abierta
         
@@ -284,9 +297,7 @@ class Door:
     
     def _draw_hit_counter(self, screen):
         """Dibuja la barra de vida de la puerta."""
-        from config import SimulationConfig
-        
-        max_hits = SimulationConfig.DOOR_HITS_TO_OPEN if self.door_type == "door" else SimulationConfig.DOOR_IRON_HITS_TO_OPEN
+        max_hits = self._max_hits
         hits_remaining = max_hits - self.hit_count
         
         if hits_remaining > 0 and not self.is_open:
@@ -310,11 +321,8 @@ class Door:
     def draw(self, screen, sprite_manager, tick):
         """Dibuja la puerta."""
         if not self.is_open:
-            sprite = sprite_manager.get_environment_sprite(self.door_type)
+            sprite = sprite_manager.get_scaled_environment_sprite(self.door_type, size=(self.width, self.height))
             if sprite:
-                # Escalar sprite si es necesario
-                if sprite.get_width() != self.width or sprite.get_height() != self.height:
-                    sprite = pygame.transform.scale(sprite, (self.width, self.height))
                 screen.blit(sprite, (self.x, self.y))
             else:
                 # Fallback: dibujar puerta simple
@@ -330,6 +338,8 @@ class Door:
 class Chest:
     """Cofre que se abre al contacto."""
     
+    __slots__ = ('x', 'y', 'is_open', 'opened_by', 'width', 'height', 'radius', '_cx', '_cy')
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -338,13 +348,14 @@ class Chest:
         self.width = 20  # Mismo tamaño que otros elementos
         self.height = 20
         self.radius = 10
+        # Centro precalculado (el cofre no se mueve)
+        self._cx = x + self.width // 2
+        self._cy = y + self.height // 2
     
     def collides_with(self, x, y, radius):
         """Verifica si hay colisión con el cofre."""
-        dx = abs(x - (self.x + self.width // 2))
-        dy = abs(y - (self.y + self.height // 2))
-        distance = (dx**2 + dy**2)**0.5
-        return distance < (self.radius + radius)
+        # Distancia contra el centro precalculado
+        return within_radius(x, y, self._cx, self._cy, self.radius + radius)
     
     def open(self, agent):
         """Abre el cofre."""
@@ -356,15 +367,13 @@ class Chest:
     
     def draw(self, screen, sprite_manager, tick):
         """Dibuja el cofre."""
+        size = (self.width, self.height)
         if self.is_open:
-            sprite = sprite_manager.get_environment_sprite('chest_opened')
+            sprite = sprite_manager.get_scaled_environment_sprite('chest_opened', size=size)
         else:
-            sprite = sprite_manager.get_environment_sprite('chest')
+            sprite = sprite_manager.get_scaled_environment_sprite('chest', size=size)
         
         if sprite:
-            # Escalar sprite si es necesario
-            if sprite.get_width() != self.width or sprite.get_height() != self.height:
-                sprite = pygame.transform.scale(sprite, (self.width, self.height))
             screen.blit(sprite, (self.x, self.y))
         else:
             # Fallback: dibujar cofre simple (más visible)
@@ -375,8 +384,7 @@ class Chest:
                 # Cerradura
                 pygame.draw.circle(screen, (139, 69, 19), (self.x + self.width // 2, self.y + self.height // 2), 4)
                 # Texto "C" para identificar
-                font = pygame.font.Font(None, 18)
-                text = font.render("C", True, (139, 69, 19))
+                text = render_text("C", 18, (139, 69, 19))  # Fuente y superficie cacheadas
                 text_rect = text.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
                 screen.blit(text, text_rect)
             else:
@@ -385,70 +393,72 @@ class Chest:
                 pygame.draw.rect(screen, (128, 128, 128), (self.x + 2, self.y + 2, self.width - 4, self.height - 4))
 
 
-class PerimeterObstacle:
-    """Obstáculo decorativo del perímetro del mapa."""
+class _TileObstacle:
+    """Tile fijo de 20x20 (perímetro o estanque) con la prueba AABB compartida."""
+    
+    # Sin __dict__ por instancia: hay cientos de tiles
+    __slots__ = ('x', 'y', 'width', 'height', 'type', 'sprite_type', '_right', '_bottom')
+    
+    TILE_TYPE = None  # 'perimeter' o 'pond' en cada subclase
     
     def __init__(self, x, y, sprite_type):
         self.x = x
         self.y = y
         self.width = 20  # TILE_SIZE
         self.height = 20  # TILE_SIZE
-        self.type = 'perimeter'
-        self.sprite_type = sprite_type  # '021', '023', '024', '026', '028', '029', '030', '031'
+        self.type = self.TILE_TYPE
+        self.sprite_type = sprite_type
+        # Bordes derecho/inferior precalculados (los tiles no se mueven)
+        self._right = x + self.width
+        self._bottom = y + self.height
     
     def collides_with(self, other_x, other_y, other_width, other_height):
         """Verifica colisión con otro objeto."""
         return (self.x < other_x + other_width and
-                self.x + self.width > other_x and
+                self._right > other_x and
                 self.y < other_y + other_height and
-                self.y + self.height > other_y)
+                self._bottom > other_y)
+
+
+class PerimeterObstacle(_TileObstacle):
+    """Obstáculo decorativo del perímetro del mapa."""
+    
+    __slots__ = ()
+    
+    TILE_TYPE = 'perimeter'  # sprite_type: '021', '023', '024', '026', '028', '029', '030', '031'
     
     def draw(self, screen, sprite_manager):
         """Dibuja el obstáculo del perímetro."""
-        sprite = sprite_manager.get_environment_sprite('perimeter', self.sprite_type)
+        # Sprite ya escalado al tamaño del tile (escalado una sola vez en el SpriteManager)
+        sprite = sprite_manager.get_scaled_environment_sprite('perimeter', self.sprite_type, (self.width, self.height))
         
         if sprite:
-            # Escalar sprite al tamaño correcto
-            sprite_scaled = pygame.transform.scale(sprite, (self.width, self.height))
-            screen.blit(sprite_scaled, (self.x, self.y))
+            screen.blit(sprite, (self.x, self.y))
         else:
             # Fallback visual si no se encuentra el sprite
             pygame.draw.rect(screen, (100, 100, 100), (self.x, self.y, self.width, self.height))
             pygame.draw.rect(screen, (80, 80, 80), (self.x + 1, self.y + 1, self.width - 2, self.height - 2))
 
 
-class PondObstacle:
+class PondObstacle(_TileObstacle):
     """Estanque móvil de 3x3 tiles."""
     
-    def __init__(self, x, y, sprite_type):
-        self.x = x
-        self.y = y
-        self.width = 20  # TILE_SIZE
-        self.height = 20  # TILE_SIZE
-        self.type = 'pond'
-        self.sprite_type = sprite_type  # '020', '021', '022', '023', '019', '024', '025', '026', '027'
+    __slots__ = ()
     
-    def collides_with(self, other_x, other_y, other_width, other_height):
-        """Verifica colisión con otro objeto."""
-        return (self.x < other_x + other_width and
-                self.x + self.width > other_x and
-                self.y < other_y + other_height and
-                self.y + self.height > other_y)
+    TILE_TYPE = 'pond'  # sprite_type: '020', '021', '022', '023', '019', '024', '025', '026', '027'
     
     def draw(self, screen, sprite_manager, tick=0):
         """Dibuja el elemento del estanque con animación de agua."""
         # Para elementos de agua (019/018), usar el mismo sistema que el agua suelta
         if self.sprite_type in ['019', '018']:
             # Usar el mismo sistema de animación que el agua suelta (cada 10 ticks)
-            water_variant = 1 if (tick // 10) % 2 == 0 else 2
-            sprite = sprite_manager.get_environment_sprite('water', water_variant)
+            sprite = sprite_manager.current_water_sprite(tick, (self.width, self.height))
         else:
-            sprite = sprite_manager.get_environment_sprite('pond', self.sprite_type)
+            sprite = sprite_manager.get_scaled_environment_sprite('pond', self.sprite_type, (self.width, self.height))
         
         if sprite:
-            # Escalar sprite al tamaño correcto
-            sprite_scaled = pygame.transform.scale(sprite, (self.width, self.height))
-            screen.blit(sprite_scaled, (self.x, self.y))
+            # Sprite ya escalado al tamaño del tile (escalado una sola vez en el SpriteManager)
+            screen.blit(sprite, (self.x, self.y))
         else:
             # Fallback visual si no se encuentra el sprite
             pygame.draw.rect(screen, (100, 150, 200), (self.x, self.y, self.width, self.height))
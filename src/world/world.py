@@ -4,7 +4,10 @@ Mundo del ecosistema con obstáculos, comida y objetos.
 
 import random
 import pygame
-from .obstacles import Obstacle, Key, Door, Chest, PerimeterObstacle, PondObstacle
+import numpy as np
+from .obstacles import Obstacle, Key, Door, Chest, PerimeterObstacle, PondObstacle, WATER_ID
+from .collision import CollisionArrays, SpatialHash, zone_rows_kernel
+from .geometry import distances_one_to_many, within_radius
 
 
 class Tree:
@@ -43,11 +46,26 @@ class World:
         self.screen_height = screen_height
         self.food_count = food_count  # Cantidad de comida configurable
         self.food_items = []
+        self._food_positions = None  # (xs, ys, items) de la comida disponible; se reconstruye al cambiar
+        # Contadores incrementales (se actualizan en cada cambio de estado, sin recorrer listas por frame)
+        self.food_remaining = 0
+        self.alive_agents_count = 0
         self.obstacles = []
+        self._obstacle_arrays = None  # CollisionArrays de los obstáculos; se reconstruye al regenerarlos/quitarlos
+        self._obstacle_hash = None  # SpatialHash de los obstáculos; se invalida junto con _obstacle_arrays
+        # Capa pre-renderizada de los obstáculos estáticos (todo menos el agua animada)
+        self._static_layer = None
+        self._static_layer_owner = None  # SpriteManager con el que se construyó
+        self._animated_obstacles = []
+        self._static_dirty = []  # Obstáculos cuyo sprite cambió (p. ej. árbol -> tronco) desde el último frame
         self.manual_obstacles = []  # Obstáculos creados manualmente
         self.trees = []  # Lista de árboles para corte
         self.perimeter_obstacles = []  # Obstáculos del perímetro decorativo
         self.pond_obstacles = []  # Obstáculos del estanque móvil
+        self._perimeter_hash = None  # SpatialHash del perímetro (se reconstruye al regenerarlo)
+        self._perimeter_cache = None  # Superficie con todo el perímetro ya dibujado
+        self._perimeter_cache_owner = None  # SpriteManager con el que se construyó
+        self._pond_hash = None  # SpatialHash del estanque (se reconstruye cuando se mueve)
         self.axe = None  # Hacha del sistema
         self.axe_picked_up = False  # Si alguien agarró el hacha
         self.last_tree_cut_tick = 0  # Último tick que se cortó un árbol
@@ -90,6 +108,10 @@ class World:
         
         # Generar perímetro decorativo
         self._generate_perimeter()
+        
+        # Compilar el kernel de zonas ahora y no en el primer tick
+        if zone_rows_kernel is not None:
+            self.zone_obstacles(0.0, 0.0, 0.0)
     
     def _check_collision_with_objects(self, x, y, radius, existing_objects):
         """Verifica colisión con objetos existentes."""
@@ -99,21 +121,38 @@ class World:
                     return True
             elif hasattr(obj, 'x') and hasattr(obj, 'y'):
                 # Para objetos simples como comida
-                distance = ((x - obj['x'])**2 + (y - obj['y'])**2)**0.5
-                if distance < radius + 15:  # Radio de seguridad
+                if within_radius(x, y, obj['x'], obj['y'], radius + 15):  # Radio de seguridad
                     return True
         
-        # Verificar colisión con obstáculos del perímetro
-        for perimeter_obj in self.perimeter_obstacles:
-            if perimeter_obj.collides_with(x, y, radius, radius):
-                return True
-        
-        # Verificar colisión con obstáculos del estanque
-        for pond_obj in self.pond_obstacles:
-            if pond_obj.collides_with(x, y, radius, radius):
-                return True
-        
-        return False
+        # Verificar colisión con obstáculos del perímetro y del estanque
+        return self.hits_perimeter(x, y, radius, radius) or self.hits_pond(x, y, radius, radius)
+    
+    def _add_food(self, food):
+        """Agrega una pieza de comida e invalida las posiciones en caché."""
+        self.food_items.append(food)
+        self._food_positions = None
+        self.food_remaining += 1
+    
+    def eat_food(self, food):
+        """Marca una pieza de comida como comida e invalida las posiciones en caché."""
+        food['eaten'] = True
+        self._food_positions = None
+        self.food_remaining -= 1
+    
+    def agent_died(self):
+        """Registra la muerte de un agente en el contador de vivos."""
+        self.alive_agents_count -= 1
+    
+    def food_distances(self, x, y):
+        """Distancias desde (x, y) a toda la comida disponible, junto con las piezas en el mismo orden."""
+        if self._food_positions is None:
+            # Apilar las posiciones una sola vez hasta el próximo cambio (no por agente ni por frame)
+            items = [f for f in self.food_items if not f['eaten']]
+            xs = np.array([f['x'] for f in items], dtype=np.float64)
+            ys = np.array([f['y'] for f in items], dtype=np.float64)
+            self._food_positions = (xs, ys, items)
+        xs, ys, items = self._food_positions
+        return distances_one_to_many(x, y, xs, ys), items
     
     def _generate_food(self, count):
         """Genera comida en el mundo, evitando obstáculos y otros objetos."""
@@ -131,17 +170,13 @@ class World:
             
             # Verificar que no esté sobre obstáculos
             valid_position = True
-            for obstacle in self.obstacles:
-                if obstacle.collides_with(food_x, food_y, 20):  # Radio más grande
-                    valid_position = False
-                    break
+            if self.hits_obstacle(food_x, food_y, 20):  # Radio más grande
+                valid_position = False
             
             # Verificar que no esté en el estanque
             if valid_position:
-                for pond_obj in self.pond_obstacles:
-                    if pond_obj.collides_with(food_x, food_y, 20, 20):
-                        valid_position = False
-                        break
+                if self.hits_pond(food_x, food_y, 20, 20):
+                    valid_position = False
             
             # Verificar que no se superponga con otra comida
             if valid_position:
@@ -151,7 +186,7 @@ class World:
                         'y': food_y,
                         'eaten': False
                     }
-                    self.food_items.append(food)
+                    self._add_food(food)
             
             attempts += 1
     
@@ -378,6 +413,11 @@ class World:
     def reset_food(self):
         """Resetea toda la comida y regenera obstáculos, preservando objetos manuales."""
         self.food_items = []
+        self._food_positions = None
+        self.food_remaining = 0
+        self._obstacle_arrays = None
+        self._obstacle_hash = None
+        self._static_layer = None
         
         # Preservar objetos manuales
         manual_obstacles_backup = self.manual_obstacles.copy()
@@ -481,10 +521,8 @@ class World:
             
             # Verificar que no esté en obstáculos
             safe_position = True
-            for obstacle in self.obstacles:
-                if obstacle.collides_with(x, y, 30):
-                    safe_position = False
-                    break
+            if self.hits_obstacle(x, y, 30):
+                safe_position = False
             
             # Verificar que tenga espacio libre alrededor
             if safe_position:
@@ -499,10 +537,8 @@ class World:
                             0 <= test_y < self.screen_height):
                             # Verificar que no esté en obstáculo
                             obstacle_free = True
-                            for obstacle in self.obstacles:
-                                if obstacle.collides_with(test_x, test_y, 20):
-                                    obstacle_free = False
-                                    break
+                            if self.hits_obstacle(test_x, test_y, 20):
+                                obstacle_free = False
                             if obstacle_free:
                                 free_space += 1
                 
@@ -671,9 +707,8 @@ class World:
                 if obstacle.type != "wall":
                     obstacles_to_remove.append(obstacle)
         
-        # Eliminar obstáculos
-        for obstacle in obstacles_to_remove:
-            self.obstacles.remove(obstacle)
+        # Eliminar obstáculos (compactación en una sola pasada, sin list.remove por elemento)
+        self._remove_obstacles(obstacles_to_remove)
         
         # print(f"🧹 Limpieza de fortalezas: {len(obstacles_to_remove)} obstáculos eliminados")
     
@@ -692,13 +727,144 @@ class World:
                     obstacles_to_remove.append(obstacle)
         
         # Eliminar obstáculos
-        for obstacle in obstacles_to_remove:
-            if obstacle in self.obstacles:
-                self.obstacles.remove(obstacle)
+        self._remove_obstacles(obstacles_to_remove)
         
         if obstacles_to_remove:
             pass  # print(f"🧹 Limpieza de fortaleza pequeña: {len(obstacles_to_remove)} obstáculos eliminados")
     
+    def _remove_obstacles(self, obstacles_to_remove):
+        """Quita varios obstáculos en una sola pasada O(N), conservando el orden y la misma lista."""
+        if not obstacles_to_remove:
+            return
+        remove_ids = {id(obstacle) for obstacle in obstacles_to_remove}
+        self.obstacles[:] = [obstacle for obstacle in self.obstacles if id(obstacle) not in remove_ids]
+        self._obstacle_arrays = None
+        self._obstacle_hash = None
+        self._static_layer = None
+    
+    def remove_obstacle(self, obstacle):
+        """Quita un obstáculo del mundo (p. ej. una poción usada)."""
+        self.obstacles.remove(obstacle)
+        self._obstacle_arrays = None
+        self._obstacle_hash = None
+        self._static_layer = None
+    
+    @property
+    def collision_arrays(self):
+        """Columnas numpy de los obstáculos (se construyen en el primer uso tras cada cambio de la lista)."""
+        if self._obstacle_arrays is None:
+            self._obstacle_arrays = CollisionArrays.from_obstacles(self.obstacles)
+        return self._obstacle_arrays
+    
+    def _deactivate_obstacle(self, obstacle):
+        """Marca un obstáculo cortado/destruido como sin colisión en las columnas ya construidas."""
+        if self._obstacle_arrays is not None:
+            self._obstacle_arrays.set_active(obstacle, False)
+        if self._static_layer is not None:
+            self._static_dirty.append(obstacle)
+    
+    def obstacle_collision_mask(self, ax, ay, radius, blocking_only=False):
+        """Máscara booleana de los obstáculos que colisionan con un círculo en (ax, ay), en una sola pasada numpy."""
+        return self.collision_arrays.collision_mask(ax, ay, radius, blocking_only)
+    
+    def obstacles_near(self, x, y, radius):
+        """Obstáculos de las celdas que toca el círculo: los únicos candidatos para collides_with."""
+        if self._obstacle_hash is None:
+            self._obstacle_hash = SpatialHash(self.obstacles)
+        return self._obstacle_hash.query(x - radius, y - radius, x + radius, y + radius)
+    
+    def zone_obstacles(self, x, y, radius):
+        """Obstáculos de agua/zona segura que tocan el círculo, en el orden de la lista."""
+        if zone_rows_kernel is None:
+            return [obstacle for obstacle in self.obstacles_near(x, y, radius)
+                    if obstacle.type in ("water", "safe") and obstacle.collides_with(x, y, radius)]
+        obstacles = self.obstacles
+        return [obstacles[row] for row in self.collision_arrays.zone_rows(x, y, radius)]
+    
+    def hits_obstacle(self, x, y, radius):
+        """Verifica si un círculo en (x, y) colisiona con algún obstáculo (los cortados no cuentan)."""
+        for obstacle in self.obstacles_near(x, y, radius):
+            if obstacle.collides_with(x, y, radius):
+                return True
+        return False
+    
+    def hits_perimeter(self, x, y, width, height):
+        """Verifica si la caja (x, y, width, height) toca el perímetro decorativo."""
+        if self._perimeter_hash is None:
+            self._perimeter_hash = SpatialHash(self.perimeter_obstacles)
+        for perimeter_obj in self._perimeter_hash.query(x, y, x + width, y + height):
+            if perimeter_obj.collides_with(x, y, width, height):
+                return True
+        return False
+    
+    def hits_pond(self, x, y, width, height):
+        """Verifica si la caja (x, y, width, height) toca el estanque."""
+        if self._pond_hash is None:
+            self._pond_hash = SpatialHash(self.pond_obstacles)
+        for pond_obj in self._pond_hash.query(x, y, x + width, y + height):
+            if pond_obj.collides_with(x, y, width, height):
+                return True
+        return False
+    
+    def draw_obstacles(self, screen, sprite_manager, tick):
+        """Dibuja los obstáculos: los estáticos en un único blit de la capa cacheada y el agua tile a tile."""
+        layer = self._static_layer
+        if (layer is None or self._static_layer_owner is not sprite_manager
+                or layer.get_size() != screen.get_size()):
+            layer = self._build_static_layer(screen.get_size(), sprite_manager, tick)
+        elif self._static_dirty:
+            self._redraw_static(self._static_dirty, sprite_manager, tick)
+        screen.blit(layer, (0, 0))
+        
+        for obstacle in self._animated_obstacles:
+            obstacle.draw(screen, sprite_manager, tick)
+    
+    def draw_perimeter(self, screen, sprite_manager):
+        """Dibuja el perímetro decorativo en un único blit de su superficie pre-renderizada."""
+        surface = self._perimeter_cache
+        if (surface is None or self._perimeter_cache_owner is not sprite_manager
+                or surface.get_size() != screen.get_size()):
+            surface = self.build_perimeter_surface(screen.get_size(), sprite_manager)
+        screen.blit(surface, (0, 0))
+    
+    def build_perimeter_surface(self, size, sprite_manager):
+        """Dibuja una vez todos los tiles del perímetro sobre una superficie transparente."""
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        for perimeter_obj in self.perimeter_obstacles:
+            perimeter_obj.draw(surface, sprite_manager)
+        self._perimeter_cache = surface
+        self._perimeter_cache_owner = sprite_manager
+        return surface
+    
+    def _build_static_layer(self, size, sprite_manager, tick):
+        """Rasteriza una vez todos los obstáculos no animados sobre una superficie transparente."""
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        animated = []
+        for obstacle in self.obstacles:
+            if obstacle._type_id == WATER_ID:
+                animated.append(obstacle)
+            else:
+                obstacle.draw(layer, sprite_manager, tick)
+        self._static_layer = layer
+        self._static_layer_owner = sprite_manager
+        self._animated_obstacles = animated
+        self._static_dirty.clear()
+        return layer
+    
+    def _redraw_static(self, changed, sprite_manager, tick):
+        """Repinta en la capa solo el área de los obstáculos que cambiaron de sprite."""
+        layer = self._static_layer
+        for obstacle in changed:
+            area = pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+            layer.fill((0, 0, 0, 0), area)
+            # Recorte al área: los vecinos se repintan solo dentro de ella (sin duplicar su alfa fuera)
+            layer.set_clip(area)
+            for neighbor in self.obstacles_near(area.centerx, area.centery, max(area.width, area.height)):
+                if neighbor._type_id != WATER_ID:
+                    neighbor.draw(layer, sprite_manager, tick)
+            layer.set_clip(None)
+        changed.clear()
+    
     def _is_inside_small_fortress(self, x, y):
         """Verifica si un punto está dentro de la fortaleza pequeña."""
         if not hasattr(self, 'small_fortress_pos') or not self.small_fortress_pos:
@@ -761,9 +927,7 @@ class World:
         obstacles_to_remove = list(set(obstacles_to_remove))
         
         # Eliminar obstáculos
-        for obstacle in obstacles_to_remove:
-            if obstacle in self.obstacles:
-                self.obstacles.remove(obstacle)
+        self._remove_obstacles(obstacles_to_remove)
         
         if obstacles_to_remove:
             pass  # print(f"🚪 Limpieza alrededor de puertas: {len(obstacles_to_remove)} obstáculos eliminados (incluye walls)")
@@ -771,8 +935,7 @@ class World:
     def check_axe_pickup(self, agent_x, agent_y):
         """Verifica si un agente agarró el hacha."""
         if self.axe and not self.axe['picked_up']:
-            distance = ((agent_x - self.axe['x'])**2 + (agent_y - self.axe['y'])**2)**0.5
-            if distance < 30:  # Rango para agarrar hacha
+            if within_radius(agent_x, agent_y, self.axe['x'], self.axe['y'], 30):  # Rango para agarrar hacha
                 self.axe['picked_up'] = True
                 self.axe_picked_up = True
                 return True
@@ -781,8 +944,8 @@ class World:
     def update_tree_cutting_status(self):
         """Actualiza el estado de corte de árboles y huts."""
         if self.axe_picked_up:
-            # Contar manzanas no comidas
-            available_food = len([f for f in self.food_items if not f['eaten']])
+            # Manzanas no comidas (contador incremental)
+            available_food = self.food_remaining
             
             # Activar/desactivar corte según umbral
             from config import SimulationConfig
@@ -822,9 +985,8 @@ class World:
         
         for obstacle in self.obstacles:
             if obstacle.type == "hut" and not obstacle.is_cut and obstacle.can_be_cut:
-                distance = ((agent_x - (obstacle.x + obstacle.width // 2))**2 + 
-                           (agent_y - (obstacle.y + obstacle.height // 2))**2)**0.5
-                if distance < 25:  # Rango para golpear hut
+                if within_radius(agent_x, agent_y, obstacle.x + obstacle.width // 2,
+                                 obstacle.y + obstacle.height // 2, 25):  # Rango para golpear hut
                     # Verificar cooldown del hut específico
                     if not hasattr(obstacle, 'last_hit_tick'):
                         obstacle.last_hit_tick = 0
@@ -834,6 +996,8 @@ class World:
                         obstacle.last_hit_tick = current_tick
                         
                         if hits:
+                            # Hut destruido: deja de colisionar
+                            self._deactivate_obstacle(obstacle)
                             # Hut destruido - generar manzanas
                             self._generate_food_from_hut_destruction()
                             # Registrar tick del golpe
@@ -862,10 +1026,8 @@ class World:
             
             # Verificar que no esté en obstáculos
             valid_position = True
-            for obstacle in self.obstacles:
-                if obstacle.collides_with(food_x, food_y, 20):
-                    valid_position = False
-                    break
+            if self.hits_obstacle(food_x, food_y, 20):
+                valid_position = False
             
             # Verificar que no esté en comida existente
             if valid_position:
@@ -876,7 +1038,7 @@ class World:
                         'eaten': False,
                         'type': 'apple'
                     }
-                    self.food_items.append(food)
+                    self._add_food(food)
                     generated += 1
             
             attempts += 1
@@ -892,8 +1054,7 @@ class World:
         
         for tree in self.trees:
             if tree.can_be_cut and not tree.is_cut:
-                distance = ((agent_x - tree.x)**2 + (agent_y - tree.y)**2)**0.5
-                if distance < 25:  # Rango para golpear árbol
+                if within_radius(agent_x, agent_y, tree.x, tree.y, 25):  # Rango para golpear árbol
                     # Verificar cooldown del árbol específico
                     if not hasattr(tree, 'last_hit_tick'):
                         tree.last_hit_tick = 0
@@ -905,6 +1066,7 @@ class World:
                         if hits and tree.should_be_cut():
                             # Cortar árbol
                             tree.cut()
+                            self._deactivate_obstacle(tree.obstacle)  # El tronco cortado deja de colisionar
                             # Generar manzanas
                             self._generate_food_from_tree_cut()
                             # Registrar tick del corte
@@ -932,17 +1094,13 @@ class World:
             
             # Verificar que no esté en obstáculos
             valid_position = True
-            for obstacle in self.obstacles:
-                if obstacle.collides_with(food_x, food_y, 20):
-                    valid_position = False
-                    break
+            if self.hits_obstacle(food_x, food_y, 20):
+                valid_position = False
             
             # Verificar que no esté en el estanque
             if valid_position:
-                for pond_obj in self.pond_obstacles:
-                    if pond_obj.collides_with(food_x, food_y, 20, 20):
-                        valid_position = False
-                        break
+                if self.hits_pond(food_x, food_y, 20, 20):
+                    valid_position = False
             
             # Verificar que no esté en comida existente
             if valid_position:
@@ -953,7 +1111,7 @@ class World:
                         'eaten': False,
                         'type': 'apple'
                     }
-                    self.food_items.append(food)
+                    self._add_food(food)
                     generated += 1  # Incrementar contador de generadas
             
             attempts += 1
@@ -995,9 +1153,8 @@ class World:
         # Umbral aumentado: radio agente (8) + margen generoso (27) = 35 px total
         if self.door and not self.door.is_open:
             if red_key_available:  # ✅ CORRECTO - Agente tiene red_key
-                distance = ((agent_x - (self.door.x + self.door.width // 2))**2 + 
-                           (agent_y - (self.door.y + self.door.height // 2))**2)**0.5
-                if distance < 25:  # Aumentado de 25 a 35 para mayor margen
+                if within_radius(agent_x, agent_y, self.door.x + self.door.width // 2,
+                                 self.door.y + self.door.height // 2, 25):  # Aumentado de 25 a 35 para mayor margen
                     if self.door.hit(current_tick, SimulationConfig.DOOR_HIT_COOLDOWN):
                         return "door"
         
@@ -1005,9 +1162,8 @@ class World:
         # Umbral aumentado: radio agente (8) + margen generoso (27) = 35 px total
         if self.door_iron and not self.door_iron.is_open:
             if gold_key_available:  # ✅ CORRECTO - Agente tiene gold_key
-                distance = ((agent_x - (self.door_iron.x + self.door_iron.width // 2))**2 + 
-                           (agent_y - (self.door_iron.y + self.door_iron.height // 2))**2)**0.5
-                if distance < 25:  # Aumentado de 25 a 35 para mayor margen
+                if within_radius(agent_x, agent_y, self.door_iron.x + self.door_iron.width // 2,
+                                 self.door_iron.y + self.door_iron.height // 2, 25):  # Aumentado de 25 a 35 para mayor margen
                     if self.door_iron.hit(current_tick, SimulationConfig.DOOR_HIT_COOLDOWN):
                         return "door_iron"
         
@@ -1037,10 +1193,8 @@ class World:
                     if not self._is_inside_fortress(x, y):
                         # Verificar que no esté en obstáculos
                         safe_position = True
-                        for obstacle in self.obstacles:
-                            if obstacle.collides_with(x, y, 30):
-                                safe_position = False
-                                break
+                        if self.hits_obstacle(x, y, 30):
+                            safe_position = False
                         
                         if safe_position:
                             self.red_key = Key(x, y, "red_key")
@@ -1097,6 +1251,8 @@ class World:
         self.perimeter_obstacles.append(PerimeterObstacle((tiles_x - 1) * tile_size, 0, '029'))  # Superior derecha
         self.perimeter_obstacles.append(PerimeterObstacle(0, (tiles_y - 1) * tile_size, '030'))  # Inferior izquierda
         self.perimeter_obstacles.append(PerimeterObstacle((tiles_x - 1) * tile_size, (tiles_y - 1) * tile_size, '031'))  # Inferior derecha
+        self._perimeter_hash = None
+        self._perimeter_cache = None
         
         
     
@@ -1112,6 +1268,7 @@ class World:
         
         # Generar estanque 4x4
         self._generate_pond_4x4(tile_size)
+        self._pond_hash = None
     
     def _generate_pond_3x3(self, tile_size):
         """Genera estanque 3x3 con agua animada."""